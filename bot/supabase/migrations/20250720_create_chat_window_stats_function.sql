@@ -0,0 +1,49 @@
+-- Chat Window Statistics RPC
+-- Created: 2025-07-20
+-- Purpose: Aggregate per-chat message statistics server-side so report
+-- generators no longer download every message row just to count them
+
+-- Returns message count, unique participants, message type buckets, UTC hourly
+-- buckets and the latest message timestamp for messages in [p_start, p_end).
+-- The chat_id equality plus date range is served by idx_messages_v1_chat_date.
+CREATE OR REPLACE FUNCTION get_chat_window_stats(
+    p_chat_id BIGINT,
+    p_start TIMESTAMP WITH TIME ZONE,
+    p_end TIMESTAMP WITH TIME ZONE
+)
+RETURNS JSONB AS $$
+    WITH window_messages AS (
+        SELECT
+            from_user_id,
+            COALESCE(message_type, 'text') AS message_type,
+            date
+        FROM messages_v1
+        WHERE chat_id = p_chat_id
+          AND date >= p_start
+          AND date < p_end
+    )
+    SELECT jsonb_build_object(
+        'total_messages', (SELECT COUNT(*) FROM window_messages),
+        'unique_participants', (SELECT COUNT(DISTINCT from_user_id) FROM window_messages),
+        'message_types', COALESCE((
+            SELECT jsonb_object_agg(message_type, message_count)
+            FROM (
+                SELECT message_type, COUNT(*) AS message_count
+                FROM window_messages
+                GROUP BY message_type
+            ) types
+        ), '{}'::jsonb),
+        'hourly_activity', COALESCE((
+            SELECT jsonb_object_agg(hour, message_count)
+            FROM (
+                SELECT to_char(date AT TIME ZONE 'UTC', 'HH24') AS hour, COUNT(*) AS message_count
+                FROM window_messages
+                GROUP BY 1
+            ) hours
+        ), '{}'::jsonb),
+        'last_message', (SELECT MAX(date) FROM window_messages)
+    );
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION get_chat_window_stats(BIGINT, TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE)
+    IS 'Per-chat message statistics for a [start, end) window, aggregated in one round trip';
@@ -0,0 +1,33 @@
+-- Batched Chat Activity RPC
+-- Created: 2025-07-21
+-- Purpose: Return 24h activity for many chats in one grouped query instead of
+-- two messages_v1 requests per chat
+
+-- For every chat in p_chat_ids with messages since p_cutoff - 24h, returns the
+-- message and participant counts since p_cutoff and for the 24 hours before it.
+-- Chats with no messages in either window are omitted.
+CREATE OR REPLACE FUNCTION get_chats_activity_24h(
+    p_chat_ids BIGINT[],
+    p_cutoff TIMESTAMP WITH TIME ZONE
+)
+RETURNS TABLE (
+    chat_id BIGINT,
+    messages_24h BIGINT,
+    participants_24h BIGINT,
+    prev_messages_24h BIGINT,
+    prev_participants_24h BIGINT
+) AS $$
+    SELECT
+        m.chat_id,
+        COUNT(*) FILTER (WHERE m.date >= p_cutoff),
+        COUNT(DISTINCT m.from_user_id) FILTER (WHERE m.date >= p_cutoff),
+        COUNT(*) FILTER (WHERE m.date < p_cutoff),
+        COUNT(DISTINCT m.from_user_id) FILTER (WHERE m.date < p_cutoff)
+    FROM messages_v1 m
+    WHERE m.chat_id = ANY(p_chat_ids)
+      AND m.date >= p_cutoff - INTERVAL '24 hours'
+    GROUP BY m.chat_id;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION get_chats_activity_24h(BIGINT[], TIMESTAMP WITH TIME ZONE)
+    IS 'Current and previous 24h message/participant counts for many chats in one round trip';
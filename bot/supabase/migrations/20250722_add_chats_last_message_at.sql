@@ -0,0 +1,41 @@
+-- Chat Last Message Timestamp
+-- Created: 2025-07-22
+-- Purpose: Track the latest message per chat on chats_v1 so active chat
+-- discovery reads one row per chat instead of every recent message
+
+ALTER TABLE chats_v1 ADD COLUMN last_message_at TIMESTAMP WITH TIME ZONE;
+
+-- Backfill from existing messages
+UPDATE chats_v1 c
+SET last_message_at = latest.last_message_at
+FROM (
+    SELECT chat_id, MAX(date) AS last_message_at
+    FROM messages_v1
+    GROUP BY chat_id
+) latest
+WHERE c.chat_id = latest.chat_id;
+
+CREATE INDEX idx_chats_v1_last_message_at ON chats_v1(last_message_at DESC);
+
+-- Keep last_message_at current as messages are ingested
+CREATE OR REPLACE FUNCTION update_chat_last_message_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE chats_v1
+    SET last_message_at = NEW.date
+    WHERE chat_id = NEW.chat_id
+      AND (last_message_at IS NULL OR last_message_at < NEW.date);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER update_chats_v1_last_message_at AFTER INSERT ON messages_v1
+    FOR EACH ROW EXECUTE FUNCTION update_chat_last_message_at();
+
+-- Only bump updated_at for changes to the chat itself, not for new messages
+DROP TRIGGER update_chats_v1_updated_at ON chats_v1;
+CREATE TRIGGER update_chats_v1_updated_at
+    BEFORE UPDATE OF chat_type, title, username, description, is_forum, member_count ON chats_v1
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+COMMENT ON COLUMN chats_v1.last_message_at IS 'Date of the most recent message in this chat, maintained by trigger';
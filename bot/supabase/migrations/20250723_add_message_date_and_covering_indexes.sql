@@ -0,0 +1,19 @@
+-- Message Date and Covering Indexes
+-- Created: 2025-07-23
+-- Purpose: Serve the global recent-message scans (filtered on date alone) and
+-- the per-chat statistics queries from indexes
+
+-- Global "messages since T" scans in get_recent_messages page through
+-- (date, id), so a plain B-tree on that pair serves both filter and order.
+-- Rows arrive roughly in date order, but late edits and backfills make a
+-- BRIN index too lossy for the hourly window.
+CREATE INDEX idx_messages_v1_date_id ON messages_v1(date DESC, id DESC);
+
+-- get_chat_window_stats and get_chats_activity_24h only read chat_id, date,
+-- from_user_id and message_type, so including the last two lets Postgres
+-- answer them with index-only scans.
+CREATE INDEX idx_messages_v1_chat_date_stats ON messages_v1(chat_id, date DESC)
+    INCLUDE (from_user_id, message_type);
+
+-- Forum topic message lookups filter on chat, thread and date together
+CREATE INDEX idx_messages_v1_thread_date ON messages_v1(chat_id, message_thread_id, date DESC);
@@ -0,0 +1,14 @@
+-- Message Change Tracking
+-- Created: 2025-07-24
+-- Purpose: Give messages_v1 an updated_at watermark so incremental mirrors
+-- can pick up edits (edit_date, text) and deletions (is_deleted)
+
+ALTER TABLE messages_v1 ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+UPDATE messages_v1 SET updated_at = created_at;
+
+CREATE INDEX idx_messages_v1_updated ON messages_v1(updated_at, id);
+
+CREATE TRIGGER update_messages_v1_updated_at BEFORE UPDATE ON messages_v1
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+COMMENT ON COLUMN messages_v1.updated_at IS 'When the row was last changed (edits, deletions); used as a sync watermark';
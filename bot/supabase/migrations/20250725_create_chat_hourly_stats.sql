@@ -0,0 +1,84 @@
+-- Hourly Chat Rollups
+-- Created: 2025-07-25
+-- Purpose: Maintain per-chat, per-UTC-hour message statistics at ingest time
+-- so dashboards and daily reports read rollups instead of raw messages
+
+CREATE TABLE chat_hourly_stats (
+    chat_id BIGINT NOT NULL,
+    hour TIMESTAMP WITH TIME ZONE NOT NULL, -- start of the UTC hour
+    message_count INTEGER NOT NULL DEFAULT 0,
+    message_types JSONB NOT NULL DEFAULT '{}'::jsonb, -- message_type -> count
+    participants BIGINT[] NOT NULL DEFAULT '{}', -- distinct from_user_ids this hour
+    last_message_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (chat_id, hour),
+    FOREIGN KEY (chat_id) REFERENCES chats_v1(chat_id) ON DELETE CASCADE
+);
+
+-- Backfill from existing messages
+WITH typed AS (
+    SELECT
+        chat_id,
+        date_trunc('hour', date AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS hour,
+        COALESCE(message_type, 'text') AS message_type,
+        COUNT(*) AS type_count,
+        MAX(date) AS last_message_at
+    FROM messages_v1
+    GROUP BY 1, 2, 3
+), hourly_users AS (
+    SELECT
+        chat_id,
+        date_trunc('hour', date AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS hour,
+        COALESCE(array_agg(DISTINCT from_user_id) FILTER (WHERE from_user_id IS NOT NULL), '{}') AS participants
+    FROM messages_v1
+    GROUP BY 1, 2
+)
+INSERT INTO chat_hourly_stats (chat_id, hour, message_count, message_types, participants, last_message_at)
+SELECT
+    t.chat_id,
+    t.hour,
+    SUM(t.type_count),
+    jsonb_object_agg(t.message_type, t.type_count),
+    u.participants,
+    MAX(t.last_message_at)
+FROM typed t
+JOIN hourly_users u ON u.chat_id = t.chat_id AND u.hour = t.hour
+GROUP BY t.chat_id, t.hour, u.participants;
+
+-- Fold each new message into its hour's rollup
+CREATE OR REPLACE FUNCTION update_chat_hourly_stats()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_type TEXT := COALESCE(NEW.message_type, 'text');
+BEGIN
+    INSERT INTO chat_hourly_stats AS s (chat_id, hour, message_count, message_types, participants, last_message_at)
+    VALUES (
+        NEW.chat_id,
+        date_trunc('hour', NEW.date AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+        1,
+        jsonb_build_object(v_type, 1),
+        CASE WHEN NEW.from_user_id IS NULL THEN '{}'::BIGINT[] ELSE ARRAY[NEW.from_user_id] END,
+        NEW.date
+    )
+    ON CONFLICT (chat_id, hour) DO UPDATE SET
+        message_count = s.message_count + 1,
+        message_types = s.message_types || jsonb_build_object(
+            v_type, COALESCE((s.message_types ->> v_type)::INTEGER, 0) + 1
+        ),
+        participants = CASE
+            WHEN NEW.from_user_id IS NULL OR NEW.from_user_id = ANY(s.participants) THEN s.participants
+            ELSE array_append(s.participants, NEW.from_user_id)
+        END,
+        last_message_at = GREATEST(s.last_message_at, NEW.date);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER update_chat_hourly_stats_on_message AFTER INSERT ON messages_v1
+    FOR EACH ROW EXECUTE FUNCTION update_chat_hourly_stats();
+
+ALTER TABLE chat_hourly_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow all operations on chat_hourly_stats" ON chat_hourly_stats
+    FOR ALL USING (true);
+
+COMMENT ON TABLE chat_hourly_stats IS 'Per-chat, per-UTC-hour message rollups maintained by trigger on messages_v1 inserts';
@@ -0,0 +1,134 @@
+-- Hourly Chat Rollups: Updates and Deletes
+-- Created: 2025-07-26
+-- Purpose: Keep chat_hourly_stats in step with messages_v1 when messages are
+-- edited, moved between buckets or deleted, and record when each bucket's
+-- messages last changed so report builds notice edits and deletions
+
+ALTER TABLE chat_hourly_stats ADD COLUMN last_updated_at TIMESTAMP WITH TIME ZONE;
+
+UPDATE chat_hourly_stats s
+SET last_updated_at = m.last_updated_at
+FROM (
+    SELECT
+        chat_id,
+        date_trunc('hour', date AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS hour,
+        MAX(updated_at) AS last_updated_at
+    FROM messages_v1
+    GROUP BY 1, 2
+) m
+WHERE s.chat_id = m.chat_id AND s.hour = m.hour;
+
+-- Recompute one bucket from messages_v1, removing it once it has no messages.
+-- Participants can't be decremented in place, so changes that move or remove
+-- a message rebuild the bucket; one chat-hour is a short range of
+-- idx_messages_v1_chat_date_stats.
+CREATE OR REPLACE FUNCTION refresh_chat_hourly_bucket(p_chat_id BIGINT, p_hour TIMESTAMP WITH TIME ZONE)
+RETURNS VOID AS $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM messages_v1
+        WHERE chat_id = p_chat_id AND date >= p_hour AND date < p_hour + INTERVAL '1 hour'
+    ) THEN
+        DELETE FROM chat_hourly_stats WHERE chat_id = p_chat_id AND hour = p_hour;
+        RETURN;
+    END IF;
+
+    INSERT INTO chat_hourly_stats (chat_id, hour, message_count, message_types, participants, last_message_at, last_updated_at)
+    SELECT
+        p_chat_id,
+        p_hour,
+        SUM(t.type_count),
+        jsonb_object_agg(t.message_type, t.type_count),
+        (
+            SELECT COALESCE(array_agg(DISTINCT from_user_id) FILTER (WHERE from_user_id IS NOT NULL), '{}')
+            FROM messages_v1
+            WHERE chat_id = p_chat_id AND date >= p_hour AND date < p_hour + INTERVAL '1 hour'
+        ),
+        MAX(t.last_message_at),
+        MAX(t.last_updated_at)
+    FROM (
+        SELECT
+            COALESCE(message_type, 'text') AS message_type,
+            COUNT(*) AS type_count,
+            MAX(date) AS last_message_at,
+            MAX(updated_at) AS last_updated_at
+        FROM messages_v1
+        WHERE chat_id = p_chat_id AND date >= p_hour AND date < p_hour + INTERVAL '1 hour'
+        GROUP BY 1
+    ) t
+    ON CONFLICT (chat_id, hour) DO UPDATE SET
+        message_count = EXCLUDED.message_count,
+        message_types = EXCLUDED.message_types,
+        participants = EXCLUDED.participants,
+        last_message_at = EXCLUDED.last_message_at,
+        last_updated_at = EXCLUDED.last_updated_at;
+END;
+$$ language 'plpgsql';
+
+-- Inserts still fold into their bucket incrementally, now also stamping
+-- last_updated_at
+CREATE OR REPLACE FUNCTION update_chat_hourly_stats()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_type TEXT := COALESCE(NEW.message_type, 'text');
+BEGIN
+    INSERT INTO chat_hourly_stats AS s (chat_id, hour, message_count, message_types, participants, last_message_at, last_updated_at)
+    VALUES (
+        NEW.chat_id,
+        date_trunc('hour', NEW.date AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+        1,
+        jsonb_build_object(v_type, 1),
+        CASE WHEN NEW.from_user_id IS NULL THEN '{}'::BIGINT[] ELSE ARRAY[NEW.from_user_id] END,
+        NEW.date,
+        NEW.updated_at
+    )
+    ON CONFLICT (chat_id, hour) DO UPDATE SET
+        message_count = s.message_count + 1,
+        message_types = s.message_types || jsonb_build_object(
+            v_type, COALESCE((s.message_types ->> v_type)::INTEGER, 0) + 1
+        ),
+        participants = CASE
+            WHEN NEW.from_user_id IS NULL OR NEW.from_user_id = ANY(s.participants) THEN s.participants
+            ELSE array_append(s.participants, NEW.from_user_id)
+        END,
+        last_message_at = GREATEST(s.last_message_at, NEW.date),
+        last_updated_at = GREATEST(s.last_updated_at, NEW.updated_at);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- Updates that change what a bucket counts rebuild the old and new buckets;
+-- other edits (text, edit_date, is_deleted) only advance last_updated_at.
+-- Hard deletes rebuild the bucket they left.
+CREATE OR REPLACE FUNCTION update_chat_hourly_stats_on_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_old_hour TIMESTAMP WITH TIME ZONE := date_trunc('hour', OLD.date AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    v_new_hour TIMESTAMP WITH TIME ZONE;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM refresh_chat_hourly_bucket(OLD.chat_id, v_old_hour);
+        RETURN OLD;
+    END IF;
+
+    v_new_hour := date_trunc('hour', NEW.date AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    IF (NEW.chat_id, NEW.date, NEW.message_type, NEW.from_user_id)
+        IS DISTINCT FROM (OLD.chat_id, OLD.date, OLD.message_type, OLD.from_user_id) THEN
+        PERFORM refresh_chat_hourly_bucket(OLD.chat_id, v_old_hour);
+        IF (NEW.chat_id, v_new_hour) IS DISTINCT FROM (OLD.chat_id, v_old_hour) THEN
+            PERFORM refresh_chat_hourly_bucket(NEW.chat_id, v_new_hour);
+        END IF;
+    ELSE
+        UPDATE chat_hourly_stats
+        SET last_updated_at = GREATEST(last_updated_at, NEW.updated_at)
+        WHERE chat_id = NEW.chat_id AND hour = v_new_hour;
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER update_chat_hourly_stats_on_message_change AFTER UPDATE OR DELETE ON messages_v1
+    FOR EACH ROW EXECUTE FUNCTION update_chat_hourly_stats_on_change();
+
+COMMENT ON TABLE chat_hourly_stats IS 'Per-chat, per-UTC-hour message rollups maintained by triggers on messages_v1 inserts, updates and deletes';
+COMMENT ON COLUMN chat_hourly_stats.last_updated_at IS 'Latest messages_v1.updated_at in the hour; changes whenever a message in it is edited or deleted';
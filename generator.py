@@ -3,18 +3,44 @@
 Wartime Milady CEO Intelligence Platform - Static Site Generator
 Milestone 1: Foundation & Homepage Structure
 """
+import argparse
+import importlib
 import json
 import shutil
+import subprocess
+import sys
 from datetime import datetime
 from pathlib import Path
+from stage_graph import StageGraph
+
+SCRIPTS_DIR = Path(__file__).resolve().parent / 'scripts'
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from build_manifest import BuildManifest, source_version
+from templating import render, publish_stylesheet, TEMPLATE_SOURCES
+
+# Fingerprint of this file and the templates, so any change to them rebuilds the pages
+TEMPLATE_VERSION = source_version(__file__, *TEMPLATE_SOURCES)
+
+def import_stage(module_name):
+    """Import a pipeline stage module from scripts/ into this process"""
+    return importlib.import_module(module_name)
 
 class MiladySiteGenerator:
-    def __init__(self, data_dir='data', output_dir='website'):
+    def __init__(self, data_dir='data', output_dir='website', in_process=True, max_workers=4):
         self.data_dir = Path(data_dir)
         self.output_dir = Path(output_dir)
         self.static_dir = Path('static')
+        # Run the data and report stages as function calls in this process
+        # (sharing data and connections) rather than as separate interpreters
+        self.in_process = in_process
+        # Stages on independent branches of the build run concurrently
+        self.max_workers = max_workers
         self.data_dir.mkdir(exist_ok=True)
         self.output_dir.mkdir(exist_ok=True)
+        # Fingerprints of the top-level pages' inputs, for skipping unchanged pages
+        self.manifest = BuildManifest(self.output_dir / '.manifest.json')
 
     def load_channel_data(self):
         data_file = self.data_dir / 'channels.json'
@@ -31,14 +57,15 @@ class MiladySiteGenerator:
         data_file = self.data_dir / 'github_repositories.json'
         if not data_file.exists():
             # Generate GitHub data if it doesn't exist
-            import subprocess
-            import sys
+            if self.in_process:
+                # Errors propagate, so the stage graph marks github_data failed
+                return import_stage('generate_github_data').generate_github_data()
             try:
                 subprocess.run([sys.executable, 'scripts/generate_github_data.py'], 
                              capture_output=True, text=True, check=True)
             except subprocess.CalledProcessError as e:
-                print(f"Warning: Could not generate GitHub data: {e}")
-                return None
+                print(f"Error output: {e.stdout}{e.stderr}")
+                raise
         
         try:
             with open(data_file, 'r') as f:
@@ -152,16 +179,7 @@ class MiladySiteGenerator:
             ]
         }
 
-    def format_military_time(self, timestamp):
-        try:
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            return dt.strftime('%Y-%m-%d %H%MZ')
-        except Exception:
-            return timestamp
-
     def generate_homepage(self, data):
-        current_time = datetime.utcnow().strftime('%Y-%m-%d %H%MZ')
-        
         # Create intelligence category cards
         intelligence_cards = [
             {
@@ -180,492 +198,44 @@ class MiladySiteGenerator:
             }
         ]
         
-        category_cards = []
-        for category in intelligence_cards:
-            card_html = f'''
-            <div class="intelligence-card" tabindex="0" aria-label="{category['name']} intelligence card" onclick="navigateToIntelligence('{category['id']}')">
-                <div class="intelligence-header">
-                    <div class="intelligence-icon">{category['icon']}</div>
-                    <div class="intelligence-info">
-                        <h3 class="intelligence-name">{category['name']}</h3>
-                        <p class="intelligence-description">{category['description']}</p>
-                    </div>
-                </div>
-                <div class="intelligence-stats">
-                    <span class="stat-badge">{category['stats']}</span>
-                </div>
-            </div>
-            '''
-            category_cards.append(card_html)
-        
-        # Use the static wartimemiladyceo.jpg for the avatar
-        avatar_html = '''
-            <img src="assets/wartimemiladyceo.jpg" alt="Wartime Milady CEO avatar" class="avatar-img" width="120" height="120" loading="lazy" style="display:block; border-radius:50%; object-fit:cover; background:#222;" onerror="this.style.display='none';this.parentNode.querySelector('.avatar-fallback').style.display='flex';">
-            <div class="avatar-fallback" style="display:none; width:120px; height:120px; align-items:center; justify-content:center; border-radius:50%; background:linear-gradient(45deg,#FF006E,#00F5FF); font-size:3rem; border:3px solid #00FF00; box-shadow:0 0 20px #FF006E,0 0 20px #00FF00;">👾</div>
-        '''
-        html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <title>Wartime Milady CEO - Intelligence Command Center</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&family=Inter:wght@400;500;700&display=swap" rel="stylesheet">
-    <style>
-{self._get_css()}
-    </style>
-</head>
-<body>
-    <div class="scan-lines"></div>
-    <header class="site-header">
-        <div class="header-content">
-            <div class="milady-avatar">
-                {avatar_html}
-            </div>
-            <div class="header-text">
-                <h1 class="site-title">Wartime Milady CEO</h1>
-                <p class="site-subtitle">Multi-Platform Intelligence Command Center</p>
-                <div class="status-bar">
-                    <span class="timestamp">{current_time}</span>
-                    <span class="status-indicator" aria-live="polite">SYSTEMS ONLINE</span>
-                </div>
-            </div>
-        </div>
-    </header>
-    <main class="main-content">
-        <div class="breadcrumb">
-            <span class="breadcrumb-item">/</span>
-        </div>
-        <div class="intelligence-grid">
-            {''.join(category_cards)}
-        </div>
-    </main>
-    
-    <footer class="site-footer">
-        <p>Generated by Wartime Milady CEO Intelligence Platform</p>
-        <p>Data updated: {self.format_military_time(data['generated_at'])}</p>
-    </footer>
-    
-    <script>
-        function navigateToIntelligence(type) {{
-            if (type === 'telegram') {{
-                window.location.href = 'telegram.html';
-            }} else if (type === 'github') {{
-                window.location.href = 'github.html';
-            }}
-        }}
-    </script>
-</body>
-</html>'''
-        
-        return html
+        return render(
+            'homepage.html',
+            stylesheet=self.site_stylesheet(),
+            current_time=datetime.utcnow().strftime('%Y-%m-%d %H%MZ'),
+            data=data,
+            intelligence_cards=intelligence_cards,
+        )
 
     def generate_telegram_page(self, data):
-        """Generate the Telegram channels page"""
-        current_time = datetime.utcnow().strftime('%Y-%m-%d %H%MZ')
-        channel_cards = []
-        for channel in data['channels']:
-            # Create safe filename for the report link - handle negative Telegram chat IDs
-            channel_id = str(channel['id'])
-            safe_filename = channel_id.replace('-', '')  # Remove minus sign for filename
-            card_html = f'''
-            <div class="channel-card" tabindex="0" aria-label="{channel['name']} channel card" onclick="showReportSelector('{channel_id}', '{channel['name']}')">
-                <div class="channel-header">
-                    <div class="channel-icon">{channel['icon']}</div>
-                    <div class="channel-info">
-                        <h3 class="channel-name">{channel['name']}</h3>
-                        <div class="channel-meta">
-                            <span class="last-update">Last: {self.format_military_time(channel['last_update'])}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="channel-stats">
-                    <div class="stat-row">
-                        <div class="stat-item">
-                            <span class="stat-label">Messages</span>
-                            <span class="stat-value">{channel['stats']['messages_24h']}</span>
-                        </div>
-                        <div class="stat-item">
-                            <span class="stat-label">Participants</span>
-                            <span class="stat-value">{channel['stats']['participants_24h']}</span>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            '''
-            channel_cards.append(card_html)
+        """
+        Generate the Telegram channels page. Report metadata is not embedded;
+        the report selector fetches reports/index/<chat>.json when opened, so
+        the page stays the same size as report history grows.
+        """
+        return render(
+            'telegram.html',
+            stylesheet=self.site_stylesheet(),
+            current_time=datetime.utcnow().strftime('%Y-%m-%d %H%MZ'),
+            data=data,
+        )
+
+    def generate_github_page(self, data, reports_metadata=None):
+        """Generate the GitHub repositories page (reports metadata defaults to website/github_reports/metadata.json)"""
+        if reports_metadata is None:
+            reports_metadata = self.load_reports_metadata('website/github_reports/metadata.json')
         
-        # Load and embed the metadata directly
-        metadata_file = Path('website/reports/metadata.json')
-        reports_metadata = {}
-        if metadata_file.exists():
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    reports_metadata = json.load(f)
-            except Exception as e:
-                print(f"Warning: Could not load metadata.json: {e}")
-        
-        # Use the static wartimemiladyceo.jpg for the avatar
-        avatar_html = '''
-            <img src="assets/wartimemiladyceo.jpg" alt="Wartime Milady CEO avatar" class="avatar-img" width="120" height="120" loading="lazy" style="display:block; border-radius:50%; object-fit:cover; background:#222;" onerror="this.style.display='none';this.parentNode.querySelector('.avatar-fallback').style.display='flex';">
-            <div class="avatar-fallback" style="display:none; width:120px; height:120px; align-items:center; justify-content:center; border-radius:50%; background:linear-gradient(45deg,#FF006E,#00F5FF); font-size:3rem; border:3px solid #00FF00; box-shadow:0 0 20px #FF006E,0 0 20px #00FF00;">👾</div>
-        '''
-        html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <title>Wartime Milady CEO - Telegram Intelligence</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&family=Inter:wght@400;500;700&display=swap" rel="stylesheet">
-    <style>
-{self._get_css()}
-    </style>
-</head>
-<body>
-    <div class="scan-lines"></div>
-    <header class="site-header">
-        <div class="header-content">
-            <div class="milady-avatar">
-                {avatar_html}
-            </div>
-            <div class="header-text">
-                <h1 class="site-title">Telegram Intelligence</h1>
-                <p class="site-subtitle">Monitoring {data['total_channels']} Ethereum-focused channels</p>
-                <div class="status-bar">
-                    <span class="timestamp">{current_time}</span>
-                    <span class="status-indicator" aria-live="polite">SYSTEMS ONLINE</span>
-                </div>
-            </div>
-        </div>
-    </header>
-    <main class="main-content">
-        <div class="breadcrumb">
-            <a href="index.html" class="breadcrumb-item">/</a>
-            <span class="breadcrumb-separator">/</span>
-            <span class="breadcrumb-item">telegram</span>
-            <span class="breadcrumb-separator">/</span>
-            <span class="breadcrumb-item">reports</span>
-        </div>
-        <div class="channel-grid">
-            {''.join(channel_cards)}
-        </div>
-    </main>
-    
-    <!-- Report Selector Popup -->
-    <div id="reportPopup" class="report-popup">
-        <div class="report-popup-content">
-            <div class="report-popup-header">
-                <h2 id="popupTitle" class="popup-title">Select Report</h2>
-                <button class="popup-close" onclick="closeReportSelector()">×</button>
-            </div>
-            <div id="reportList" class="report-list">
-                <!-- Reports will be loaded here -->
-            </div>
-        </div>
-    </div>
-    
-    <footer class="site-footer">
-        <p>Generated by Wartime Milady CEO Intelligence Platform</p>
-        <p>Data updated: {self.format_military_time(data['generated_at'])}</p>
-    </footer>
-    
-    <script>
-        // Embed metadata directly in the HTML to avoid CORS issues
-        const reportsMetadata = {json.dumps(reports_metadata)};
-        
-        function showReportSelector(chatId, chatName) {{
-            const popup = document.getElementById('reportPopup');
-            const title = document.getElementById('popupTitle');
-            const reportList = document.getElementById('reportList');
-            
-            console.log('showReportSelector called with:', {{ chatId, chatName }});
-            console.log('reportsMetadata:', reportsMetadata);
-            
-            title.textContent = `Select Report - ${{chatName}}`;
-            
-            // Remove minus sign from chat ID for metadata lookup
-            const metadataKey = chatId.replace('-', '');
-            console.log('Looking for metadata key:', metadataKey);
-            
-            if (!reportsMetadata[metadataKey]) {{
-                console.log('No reports found for key:', metadataKey);
-                console.log('Available keys:', Object.keys(reportsMetadata));
-                reportList.innerHTML = '<p class="no-reports">No reports available for this channel.</p>';
-                popup.style.display = 'flex';
-                return;
-            }}
-            
-            const reports = reportsMetadata[metadataKey].reports;
-            console.log('Found reports:', reports);
-            let html = '';
-            
-            reports.forEach(report => {{
-                const date = new Date(report.date);
-                const formattedDate = date.toLocaleDateString('en-US', {{ 
-                    weekday: 'long', 
-                    year: 'numeric', 
-                    month: 'long', 
-                    day: 'numeric' 
-                }});
-                
-                const messages = report.total_messages || 0;
-                const participants = report.unique_participants || 0;
-                
-                html += `
-                    <div class="report-item" onclick="openReport('${{report.filename}}')">
-                        <div class="report-date">${{formattedDate}}</div>
-                        <div class="report-stats">
-                            <span class="stat-badge messages">${{messages}} messages</span>
-                            <span class="stat-badge participants">${{participants}} participants</span>
-                        </div>
-                        <div class="report-filename">${{report.filename}}</div>
-                    </div>
-                `;
-            }});
-            
-            reportList.innerHTML = html;
-            popup.style.display = 'flex';
-        }}
-        
-        function closeReportSelector() {{
-            document.getElementById('reportPopup').style.display = 'none';
-        }}
-        
-        function openReport(filename) {{
-            window.open(`reports/${{filename}}`, '_blank');
-            closeReportSelector();
-        }}
-        
-        // Close popup when clicking outside
-        document.getElementById('reportPopup').addEventListener('click', function(e) {{
-            if (e.target === this) {{
-                closeReportSelector();
-            }}
-        }});
-        
-        // Close popup with Escape key
-        document.addEventListener('keydown', function(e) {{
-            if (e.key === 'Escape') {{
-                closeReportSelector();
-            }}
-        }});
-    </script>
-</body>
-</html>'''
-        
-        return html
-
-    def generate_github_page(self, data):
-        """Generate the GitHub repositories page"""
-        current_time = datetime.utcnow().strftime('%Y-%m-%d %H%MZ')
-        repo_cards = []
-        for repo in data['repositories']:
-            # Create safe filename for the report link
-            repo_id = repo['id']
-            safe_filename = repo_id.replace('/', '_').replace('-', '_')
-            card_html = f'''
-            <div class="repo-card" tabindex="0" aria-label="{repo['name']} repository card" onclick="showGitHubReportSelector('{repo_id}', '{repo['name']}')">
-                <div class="repo-header">
-                    <div class="repo-icon">{repo['icon']}</div>
-                    <div class="repo-info">
-                        <h3 class="repo-name">{repo['name']}</h3>
-                        <p class="repo-description">{repo.get('description', 'No description available')}</p>
-                        <div class="repo-meta">
-                            <span class="language">{repo.get('language', 'Unknown')}</span>
-                            <span class="last-update">Last: {self.format_military_time(repo['last_update'])}</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="repo-stats">
-                    <div class="stat-row">
-                        <div class="stat-item">
-                            <span class="stat-label">Commits (7d)</span>
-                            <span class="stat-value">{repo['stats']['commits_7d']}</span>
-                        </div>
-                        <div class="stat-item">
-                            <span class="stat-label">Contributors (7d)</span>
-                            <span class="stat-value">{repo['stats']['contributors_7d']}</span>
-                        </div>
-                    </div>
-                    <div class="stat-row">
-                        <div class="stat-item">
-                            <span class="stat-label">Stars</span>
-                            <span class="stat-value">{repo.get('stars', 0):,}</span>
-                        </div>
-                        <div class="stat-item">
-                            <span class="stat-label">Forks</span>
-                            <span class="stat-value">{repo.get('forks', 0):,}</span>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            '''
-            repo_cards.append(card_html)
-        
-        # Load and embed the metadata directly
-        metadata_file = Path('website/github_reports/metadata.json')
-        reports_metadata = {}
-        if metadata_file.exists():
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    reports_metadata = json.load(f)
-            except Exception as e:
-                print(f"Warning: Could not load GitHub metadata.json: {e}")
-        
-        # Use the static wartimemiladyceo.jpg for the avatar
-        avatar_html = '''
-            <img src="assets/wartimemiladyceo.jpg" alt="Wartime Milady CEO avatar" class="avatar-img" width="120" height="120" loading="lazy" style="display:block; border-radius:50%; object-fit:cover; background:#222;" onerror="this.style.display='none';this.parentNode.querySelector('.avatar-fallback').style.display='flex';">
-            <div class="avatar-fallback" style="display:none; width:120px; height:120px; align-items:center; justify-content:center; border-radius:50%; background:linear-gradient(45deg,#FF006E,#00F5FF); font-size:3rem; border:3px solid #00FF00; box-shadow:0 0 20px #FF006E,0 0 20px #00FF00;">👾</div>
-        '''
-        html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <title>Wartime Milady CEO - GitHub Intelligence</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&family=Inter:wght@400;500;700&display=swap" rel="stylesheet">
-    <style>
-{self._get_css()}
-    </style>
-</head>
-<body>
-    <div class="scan-lines"></div>
-    <header class="site-header">
-        <div class="header-content">
-            <div class="milady-avatar">
-                {avatar_html}
-            </div>
-            <div class="header-text">
-                <h1 class="site-title">GitHub Intelligence</h1>
-                <p class="site-subtitle">Monitoring {data['total_repositories']} Ethereum repositories</p>
-                <div class="status-bar">
-                    <span class="timestamp">{current_time}</span>
-                    <span class="status-indicator" aria-live="polite">SYSTEMS ONLINE</span>
-                </div>
-            </div>
-        </div>
-    </header>
-    <main class="main-content">
-        <div class="breadcrumb">
-            <a href="index.html" class="breadcrumb-item">/</a>
-            <span class="breadcrumb-separator">/</span>
-            <span class="breadcrumb-item">github</span>
-            <span class="breadcrumb-separator">/</span>
-            <span class="breadcrumb-item">reports</span>
-        </div>
-        <div class="repo-grid">
-            {''.join(repo_cards)}
-        </div>
-    </main>
-    
-    <!-- GitHub Report Selector Popup -->
-    <div id="githubReportPopup" class="report-popup">
-        <div class="report-popup-content">
-            <div class="report-popup-header">
-                <h2 id="githubPopupTitle" class="popup-title">Select Report</h2>
-                <button class="popup-close" onclick="closeGitHubReportSelector()">×</button>
-            </div>
-            <div id="githubReportList" class="report-list">
-                <!-- Reports will be loaded here -->
-            </div>
-        </div>
-    </div>
-    
-    <footer class="site-footer">
-        <p>Generated by Wartime Milady CEO Intelligence Platform</p>
-        <p>Data updated: {self.format_military_time(data['generated_at'])}</p>
-    </footer>
-    
-    <script>
-        // Embed metadata directly in the HTML to avoid CORS issues
-        const githubReportsMetadata = {json.dumps(reports_metadata)};
-        
-        function showGitHubReportSelector(repoId, repoName) {{
-            const popup = document.getElementById('githubReportPopup');
-            const title = document.getElementById('githubPopupTitle');
-            const reportList = document.getElementById('githubReportList');
-            
-            console.log('showGitHubReportSelector called with:', {{ repoId, repoName }});
-            console.log('githubReportsMetadata:', githubReportsMetadata);
-            
-            title.textContent = `Select Report - ${{repoName}}`;
-            
-            // Use the repo ID as the metadata key
-            const metadataKey = repoId.replace('/', '_');
-            console.log('Looking for metadata key:', metadataKey);
-            
-            if (!githubReportsMetadata[metadataKey]) {{
-                console.log('No reports found for key:', metadataKey);
-                console.log('Available keys:', Object.keys(githubReportsMetadata));
-                reportList.innerHTML = '<p class="no-reports">No reports available for this repository.</p>';
-                popup.style.display = 'flex';
-                return;
-            }}
-            
-            const reports = githubReportsMetadata[metadataKey].reports;
-            console.log('Found reports:', reports);
-            let html = '';
-            
-            reports.forEach(report => {{
-                const date = new Date(report.date);
-                const formattedDate = date.toLocaleDateString('en-US', {{ 
-                    weekday: 'long', 
-                    year: 'numeric', 
-                    month: 'long', 
-                    day: 'numeric' 
-                }});
-                
-                const commits = report.commits || 0;
-                const contributors = report.contributors || 0;
-                
-                html += `
-                    <div class="report-item" onclick="openGitHubReport('${{report.filename}}')">
-                        <div class="report-date">${{formattedDate}}</div>
-                        <div class="report-stats">
-                            <span class="stat-badge commits">${{commits}} commits</span>
-                            <span class="stat-badge contributors">${{contributors}} contributors</span>
-                        </div>
-                        <div class="report-filename">${{report.filename}}</div>
-                    </div>
-                `;
-            }});
-            
-            reportList.innerHTML = html;
-            popup.style.display = 'flex';
-        }}
-        
-        function closeGitHubReportSelector() {{
-            document.getElementById('githubReportPopup').style.display = 'none';
-        }}
-        
-        function openGitHubReport(filename) {{
-            window.open(`github_reports/${{filename}}`, '_blank');
-            closeGitHubReportSelector();
-        }}
-        
-        // Close popup when clicking outside
-        document.getElementById('githubReportPopup').addEventListener('click', function(e) {{
-            if (e.target === this) {{
-                closeGitHubReportSelector();
-            }}
-        }});
-        
-        // Close popup with Escape key
-        document.addEventListener('keydown', function(e) {{
-            if (e.key === 'Escape') {{
-                closeGitHubReportSelector();
-            }}
-        }});
-    </script>
-</body>
-</html>'''
-        
-        return html
+        return render(
+            'github.html',
+            stylesheet=self.site_stylesheet(),
+            current_time=datetime.utcnow().strftime('%Y-%m-%d %H%MZ'),
+            data=data,
+            # Embedded in the page to avoid CORS issues
+            reports_metadata=reports_metadata,
+        )
+
+    def site_stylesheet(self):
+        """Publish the top-level pages' stylesheet into the output assets and return its URL"""
+        return publish_stylesheet('site', self._get_css(), self.output_dir / 'assets', self.output_dir)
 
     def _get_css(self):
         return '''
@@ -1495,36 +1065,56 @@ h1.site-title {
                     shutil.copy2(item, assets_output)
                 elif item.is_dir():
                     shutil.copytree(item, assets_output / item.name, dirs_exist_ok=True)
+        print("📁 Copied static assets")
+
+    def generate_report_pages(self, data, github_data=None):
+        """Generate individual report pages for each channel and repository"""
+        return self.generate_telegram_reports(data), self.generate_github_reports(github_data)
 
-    def generate_report_pages(self, data):
-        """Generate individual report pages for each channel"""
+    def generate_telegram_reports(self, data):
+        """
+        Generate the daily Telegram report pages and return their metadata
+        (None if it was only written to disk). Stage errors are raised.
+        """
         print("📊 Generating daily report pages...")
+        if self.in_process:
+            reports = import_stage('generate_report_pages').generate_all_reports(channels_data=data)
+            print("✅ Generated daily report pages")
+            return reports
         
-        # Import and run the daily report generation script
-        import subprocess
-        import sys
-        
+        # Run the daily report generation script
         try:
             result = subprocess.run([sys.executable, 'scripts/generate_report_pages.py'], 
                                   capture_output=True, text=True, check=True)
             print(result.stdout)
         except subprocess.CalledProcessError as e:
-            print(f"⚠️  Error generating daily reports: {e}")
-            print(f"Error output: {e.stderr}")
+            print(f"Error output: {e.stdout}{e.stderr}")
+            raise
         
         print(f"✅ Generated daily report pages")
-        
-        # Generate GitHub reports
+        return None
+
+    def generate_github_reports(self, github_data):
+        """
+        Generate the daily GitHub report pages and return their metadata
+        (None if it was only written to disk). Stage errors are raised.
+        """
         print("📊 Generating GitHub report pages...")
+        if self.in_process:
+            reports = import_stage('generate_github_reports').generate_all_github_reports(repos_data=github_data)
+            print("✅ Generated GitHub report pages")
+            return reports
+        
         try:
             result = subprocess.run([sys.executable, 'scripts/generate_github_reports.py'], 
                                   capture_output=True, text=True, check=True)
             print(result.stdout)
         except subprocess.CalledProcessError as e:
-            print(f"⚠️  Error generating GitHub reports: {e}")
-            print(f"Error output: {e.stderr}")
+            print(f"Error output: {e.stdout}{e.stderr}")
+            raise
         
         print(f"✅ Generated GitHub report pages")
+        return None
 
     def _get_report_css(self):
         """Get CSS for report pages"""
@@ -1849,48 +1439,112 @@ h1.site-title {
 }
 '''
 
-    def generate_site(self):
-        print("🚀 Generating Wartime Milady CEO Intelligence Platform...")
-        data = self.load_channel_data()
-        print(f"📊 Loaded data for {data['total_channels']} channels")
+    def write_page(self, filename, render, inputs, label):
+        """
+        Write a top-level page into the output directory by calling render(),
+        unless the page was already built from the same inputs.
+        """
+        path = self.output_dir / filename
+        fingerprint = BuildManifest.fingerprint(TEMPLATE_VERSION, inputs)
+        if self.manifest.is_current(path, fingerprint):
+            print(f"📄 Unchanged {label}: {path}")
+            return path
         
-        # Generate homepage
-        homepage_html = self.generate_homepage(data)
-        homepage_path = self.output_dir / 'index.html'
-        with open(homepage_path, 'w', encoding='utf-8') as f:
-            f.write(homepage_html)
-        print(f"📄 Generated homepage: {homepage_path}")
+        html = render()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        self.manifest.record(path, fingerprint)
+        print(f"📄 Generated {label}: {path}")
+        return path
+
+    def load_reports_metadata(self, metadata_file):
+        """Load a reports metadata.json written by a report stage (empty if unavailable)"""
+        if not Path(metadata_file).exists():
+            return {}
+        try:
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load {metadata_file}: {e}")
+            return {}
+
+    def build_stage_graph(self):
+        """
+        Describe the build as stages with their inputs and outputs. The
+        Telegram and GitHub branches share nothing, so they run side by side.
+        The GitHub page waits for its reports so it embeds fresh metadata; the
+        Telegram page fetches its report indexes in the browser, so it doesn't.
+        """
+        graph = StageGraph(max_workers=self.max_workers)
+        
+        graph.add_stage('channel_data', self.load_channel_data, outputs=['channels'], branch='site')
+        graph.add_stage('homepage', lambda channels: self.write_page(
+            'index.html', lambda: self.generate_homepage(channels), channels, 'homepage'
+        ), inputs=['channels'], branch='site')
+        graph.add_stage('telegram_reports', lambda channels: self.generate_telegram_reports(channels),
+                        inputs=['channels'], outputs=['telegram_reports'], branch='telegram')
+        graph.add_stage('telegram_page', self.write_telegram_page, inputs=['channels'], branch='telegram')
         
-        # Generate Telegram page
-        telegram_html = self.generate_telegram_page(data)
-        telegram_path = self.output_dir / 'telegram.html'
-        with open(telegram_path, 'w', encoding='utf-8') as f:
-            f.write(telegram_html)
-        print(f"📄 Generated Telegram page: {telegram_path}")
+        graph.add_stage('github_data', self.load_github_data, outputs=['github_data'], branch='github')
+        graph.add_stage('github_reports', self.generate_github_reports,
+                        inputs=['github_data'], outputs=['github_reports'], branch='github')
+        graph.add_stage('github_page', self.write_github_page, inputs=['github_data', 'github_reports'],
+                        branch='github')
         
-        # Generate GitHub page
-        github_data = self.load_github_data()
-        if github_data:
-            github_html = self.generate_github_page(github_data)
-            github_path = self.output_dir / 'github.html'
-            with open(github_path, 'w', encoding='utf-8') as f:
-                f.write(github_html)
-            print(f"📄 Generated GitHub page: {github_path}")
-        else:
+        graph.add_stage('static_assets', self.copy_static_assets, branch='site')
+        return graph
+
+    def write_github_page(self, github_data, github_reports):
+        """Write github.html, or skip it when no GitHub data could be loaded"""
+        if not github_data:
             print("⚠️  Could not load GitHub data, skipping GitHub page generation.")
+            return None
+        if github_reports is None:
+            github_reports = self.load_reports_metadata('website/github_reports/metadata.json')
+        return self.write_page(
+            'github.html', lambda: self.generate_github_page(github_data, github_reports),
+            [github_data, github_reports], 'GitHub page'
+        )
+
+    def write_telegram_page(self, channels):
+        """Write telegram.html, which only changes when the channels do"""
+        return self.write_page(
+            'telegram.html', lambda: self.generate_telegram_page(channels), channels, 'Telegram page'
+        )
+
+    def generate_site(self):
+        print("🚀 Generating Wartime Milady CEO Intelligence Platform...")
+        graph = self.build_stage_graph()
+        artifacts = graph.run()
+        graph.print_report()
+        self.manifest.save()
+        print(f"📄 Top-level pages: {self.manifest.summary()}")
         
-        # Generate report pages
-        self.generate_report_pages(data)
+        if graph.errors:
+            # Every branch that could build has been written, so its output
+            # can still be published; the failure only sets the exit code
+            branches = graph.branch_status()
+            built = [branch for branch, (status, _) in branches.items() if status == 'ok']
+            print(f"❌ Site generation finished with {len(graph.errors)} failed stage(s): {', '.join(graph.errors)}")
+            print(f"📦 Complete branches still written: {', '.join(built) or 'none'}")
+            return False
         
-        self.copy_static_assets()
-        print("📁 Copied static assets")
+        print(f"📊 Built site for {artifacts['channels']['total_channels']} channels")
         print("✅ Site generation complete!")
         print(f"📂 Output directory: {self.output_dir.absolute()}")
         return True
 
 def main():
-    generator = MiladySiteGenerator()
-    generator.generate_site()
+    parser = argparse.ArgumentParser(description='Generate the Wartime Milady CEO static site')
+    parser.add_argument('--subprocess', action='store_true',
+                        help='run the data and report stages as separate scripts instead of in-process')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='number of build stages that may run at the same time')
+    args = parser.parse_args()
+    
+    generator = MiladySiteGenerator(in_process=not args.subprocess, max_workers=args.workers)
+    if not generator.generate_site():
+        sys.exit(1)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
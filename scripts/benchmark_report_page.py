@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark Report Page Rendering
+Renders one synthetic, very busy chat day (the page plus its full paged
+message archive) and reports the time and peak memory it took. Both should
+grow linearly with the number of messages: the cost per message stays flat
+across sizes.
+
+Runs against an in-memory backend, so no credentials are needed:
+
+    python scripts/benchmark_report_page.py              # 5k, 10k, 25k and 50k messages
+    python scripts/benchmark_report_page.py 50000 100000
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from telegram_data import MemoryBackend, set_backend
+import generate_report_pages
+
+CHAT_ID = -1000000000001
+USER_COUNT = 500
+DEFAULT_SIZES = [5000, 10000, 25000, 50000]
+
+
+def synthetic_day(message_count, day_start):
+    """Tables for one chat with message_count messages spread over one UTC day"""
+    step = 86400 / message_count
+    messages = [
+        {
+            'id': i,
+            'telegram_message_id': i,
+            'chat_id': CHAT_ID,
+            'from_user_id': i % USER_COUNT + 1,
+            'date': (day_start + timedelta(seconds=i * step)).isoformat(),
+            'text': f"Message {i} about blobs, gas limits & <client> releases " * 2,
+            'message_type': 'text' if i % 10 else 'photo',
+        }
+        for i in range(1, message_count + 1)
+    ]
+    return {
+        'chats_v1': [{'chat_id': CHAT_ID, 'chat_type': 'supergroup', 'title': 'Benchmark Chat'}],
+        'users_v1': [{'user_id': u, 'first_name': f'User{u}', 'last_name': 'Bench'} for u in range(1, USER_COUNT + 1)],
+        'messages_v1': messages,
+    }
+
+
+def benchmark(message_count, output_dir):
+    """Render the day twice, timed and then traced; return (seconds, peak bytes, output bytes)"""
+    day_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    day_end = day_start + timedelta(days=1)
+    set_backend(MemoryBackend(synthetic_day(message_count, day_start)))
+
+    # Load the data up front so only rendering and writing are measured
+    snapshot = generate_report_pages.load_chat_snapshot(CHAT_ID, day_start, day_end)
+
+    def render():
+        return generate_report_pages.generate_report_page(
+            CHAT_ID, day_start, day_end, output_dir=output_dir, snapshot=snapshot
+        )
+
+    # Warm the template cache so the first size isn't charged for compiling
+    render()
+    started = time.perf_counter()
+    output_file = render()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    archive_dir = output_file.parent / generate_report_pages.MESSAGE_ARCHIVE_DIR / output_file.stem
+    output_size = output_file.stat().st_size + sum(f.stat().st_size for f in archive_dir.iterdir())
+    return elapsed, peak, output_size
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+
+    print("⏱️  Report page rendering (page and full message archive)")
+    print(f"{'messages':>10} {'time':>9} {'µs/msg':>8} {'peak MB':>9} {'bytes/msg':>10} {'output MB':>9}")
+    with tempfile.TemporaryDirectory() as site_dir:
+        # Pages publish their stylesheet into assets/ beside the reports
+        # directory, so mirror the site layout inside the temporary directory
+        output_dir = Path(site_dir) / 'reports'
+        for size in sizes:
+            elapsed, peak, output_size = benchmark(size, output_dir)
+            print(f"{size:>10} {elapsed:>8.2f}s {elapsed / size * 1e6:>8.1f} "
+                  f"{peak / 1e6:>9.1f} {peak / size:>10.0f} {output_size / 1e6:>9.1f}")
+    set_backend(None)
+
+
+if __name__ == "__main__":
+    main()
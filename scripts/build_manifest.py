@@ -0,0 +1,77 @@
+"""
+Build manifest for incremental page generation.
+
+Each generated page is recorded with a fingerprint of its inputs: the data
+it displays plus a version of the code that renders it. On the next build a
+page whose fingerprint is unchanged, and whose file still exists, is
+skipped without being rendered or written.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+
+def source_version(*paths):
+    """Fingerprint of the given source files, so any template change rebuilds their pages"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class BuildManifest:
+    """Page fingerprints for one output directory, persisted as JSON."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self.rebuilt = 0
+        self.skipped = 0
+        # Report pages are built on worker threads that share one manifest
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable build manifest {self.path}: {e}")
+
+    @staticmethod
+    def fingerprint(*inputs):
+        """Stable hash of JSON-serialisable page inputs"""
+        payload = json.dumps(inputs, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _key(self, page):
+        return Path(page).as_posix()
+
+    def is_current(self, page, fingerprint):
+        """Whether ``page`` exists and was built from inputs with this fingerprint"""
+        with self._lock:
+            current = self.entries.get(self._key(page)) == fingerprint and Path(page).exists()
+            if current:
+                self.skipped += 1
+            return current
+
+    def record(self, page, fingerprint):
+        """Remember the fingerprint ``page`` was just built from"""
+        with self._lock:
+            self.entries[self._key(page)] = fingerprint
+            self.rebuilt += 1
+
+    def save(self):
+        """Write the manifest, dropping entries for pages that no longer exist"""
+        with self._lock:
+            self.entries = {page: fp for page, fp in sorted(self.entries.items()) if Path(page).exists()}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def summary(self):
+        return f"{self.rebuilt} rebuilt, {self.skipped} unchanged and skipped"
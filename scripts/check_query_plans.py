@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Check Query Plans
+Runs EXPLAIN on the SQL behind each generator query and confirms that every
+messages_v1/chats_v1 access is served by an index.
+
+Requires DATABASE_URL to point at the Supabase Postgres instance.
+Sequential scans are disabled for the session, so a Seq Scan in a plan means
+no index can serve that query at all (small tables would otherwise always
+be seq scanned regardless of the indexes available).
+"""
+
+import os
+import sys
+import json
+from datetime import datetime, timedelta
+import psycopg2
+
+SAMPLE_CHAT_ID = -1001234567890
+
+# (name, sql, expected access) where expected is 'index' or 'index-only'
+GENERATOR_QUERIES = [
+    (
+        'get_recent_messages (generate_telegram_summary.py)',
+        '''SELECT id, telegram_message_id, chat_id, from_user_id, message_thread_id, date, edit_date,
+                  text, message_type, reply_to_message_id, reply_to_chat_id, is_deleted
+           FROM messages_v1 WHERE date >= %(since)s ORDER BY date, id LIMIT 1000''',
+        'index'
+    ),
+    (
+        'get_chat_messages (generate_report_pages.py)',
+        '''SELECT id, telegram_message_id, from_user_id, date, text, message_type, reply_to_message_id
+           FROM messages_v1 WHERE chat_id = %(chat_id)s AND date >= %(start)s AND date < %(end)s
+           ORDER BY date DESC, id DESC LIMIT 1000''',
+        'index'
+    ),
+    (
+        'get_chat_window_stats (migration 20250720)',
+        '''SELECT COUNT(*), COUNT(DISTINCT from_user_id), MAX(date)
+           FROM messages_v1 WHERE chat_id = %(chat_id)s AND date >= %(start)s AND date < %(end)s''',
+        'index-only'
+    ),
+    (
+        'get_chat_window_stats message types',
+        '''SELECT COALESCE(message_type, 'text'), COUNT(*)
+           FROM messages_v1 WHERE chat_id = %(chat_id)s AND date >= %(start)s AND date < %(end)s
+           GROUP BY 1''',
+        'index-only'
+    ),
+    (
+        'get_chats_activity_24h (migration 20250721)',
+        '''SELECT chat_id, COUNT(*), COUNT(DISTINCT from_user_id)
+           FROM messages_v1 WHERE chat_id = ANY(%(chat_ids)s) AND date >= %(start)s
+           GROUP BY chat_id''',
+        'index-only'
+    ),
+    (
+        'get_chats_active_since (generate_milady_data.py)',
+        '''SELECT * FROM chats_v1 WHERE last_message_at >= %(start)s ORDER BY last_message_at DESC''',
+        'index'
+    ),
+    (
+        'get_chat_hourly_stats (generate_report_pages.py)',
+        '''SELECT hour, message_count, message_types, participants, last_message_at
+           FROM chat_hourly_stats WHERE chat_id = %(chat_id)s AND hour >= %(start)s AND hour < %(end)s
+           ORDER BY hour LIMIT 1000''',
+        'index'
+    ),
+    (
+        'get_forum_topics (generate_telegram_summary.py)',
+        '''SELECT * FROM forum_topics_v1 WHERE chat_id = ANY(%(chat_ids)s)''',
+        'index'
+    ),
+]
+
+def walk_plan(plan):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree"""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from walk_plan(child)
+
+def explain(cursor, sql, params):
+    """Return the root plan node for a query"""
+    cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+    result = cursor.fetchone()[0]
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]['Plan']
+
+def check_plan(plan, expected):
+    """Check a plan's table accesses; return (ok, list of access descriptions)"""
+    accesses = []
+    ok = True
+    for node in walk_plan(plan):
+        relation = node.get('Relation Name')
+        if not relation:
+            continue
+        node_type = node['Node Type']
+        index_name = node.get('Index Name')
+        accesses.append(f"{node_type} on {relation}" + (f" using {index_name}" if index_name else ''))
+
+        if node_type == 'Seq Scan':
+            ok = False
+        elif expected == 'index-only' and relation == 'messages_v1' and node_type != 'Index Only Scan':
+            ok = False
+    return ok, accesses
+
+def main():
+    """Explain every generator query and report index usage"""
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        print("Error: DATABASE_URL environment variable is required")
+        sys.exit(1)
+
+    now = datetime.utcnow()
+    params = {
+        'chat_id': SAMPLE_CHAT_ID,
+        'chat_ids': [SAMPLE_CHAT_ID],
+        'since': now - timedelta(hours=1),
+        'start': now - timedelta(days=1),
+        'end': now,
+    }
+
+    print("🔍 Checking generator query plans")
+    print("=" * 40)
+
+    failures = 0
+    connection = psycopg2.connect(database_url)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+            for name, sql, expected in GENERATOR_QUERIES:
+                ok, accesses = check_plan(explain(cursor, sql, params), expected)
+                print(f"{'✅' if ok else '❌'} {name} (expects {expected} scan)")
+                for access in accesses:
+                    print(f"   {access}")
+                if not ok:
+                    failures += 1
+    finally:
+        connection.close()
+
+    if failures:
+        print(f"\n❌ {failures} of {len(GENERATOR_QUERIES)} queries are not fully index-backed")
+        return False
+
+    print(f"\n✅ All {len(GENERATOR_QUERIES)} generator queries are index-backed")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
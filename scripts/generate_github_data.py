@@ -6,16 +6,43 @@ Generates repository data from GitHub config for the intelligence platform.
 
 import json
 import os
+import re
 import sys
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+from github_cache import open_github_cache
+
 # Load environment variables
 load_dotenv()
 
-def check_github_credentials():
+# Number of GitHub API requests in flight at once (set GITHUB_WORKERS)
+DEFAULT_GITHUB_WORKERS = 16
+
+def get_github_workers():
+    """Get the number of GitHub API requests to run at once"""
+    try:
+        return max(1, int(os.getenv('GITHUB_WORKERS', DEFAULT_GITHUB_WORKERS)))
+    except ValueError:
+        print(f"⚠️  Ignoring invalid GITHUB_WORKERS={os.getenv('GITHUB_WORKERS')!r}, using {DEFAULT_GITHUB_WORKERS}")
+        return DEFAULT_GITHUB_WORKERS
+
+def create_github_session(workers):
+    """
+    HTTP session shared by every API request, keeping connections to
+    api.github.com alive instead of opening a new TLS connection per call.
+    Its pool holds one connection per worker so none is ever discarded.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount('https://', adapter)
+    return session
+
+def check_github_credentials(session=None):
     """Check if GitHub credentials are properly configured"""
     github_token = os.getenv('GITHUB_TOKEN')
     if not github_token:
@@ -28,7 +55,7 @@ def check_github_credentials():
     }
     
     try:
-        response = requests.get('https://api.github.com/user', headers=headers)
+        response = (session or requests).get('https://api.github.com/user', headers=headers)
         if response.status_code == 401:
             raise ValueError("Invalid GitHub token. Please check your GITHUB_TOKEN.")
         elif response.status_code != 200:
@@ -68,22 +95,61 @@ def load_github_config():
         print(f"❌ Error loading GitHub config: {e}")
         return None
 
-def fetch_repository_data(repo_url, headers):
-    """Fetch repository data from GitHub API"""
-    # Extract owner and repo from URL
+def parse_repository_url(repo_url):
+    """(owner, repo) of a https://github.com/<owner>/<repo> URL"""
     if repo_url.startswith('https://github.com/'):
         parts = repo_url.replace('https://github.com/', '').split('/')
         if len(parts) >= 2:
-            owner, repo = parts[0], parts[1]
-        else:
-            raise ValueError(f"Invalid GitHub URL format: {repo_url}")
-    else:
-        raise ValueError(f"Invalid GitHub URL: {repo_url}")
-    
-    # Fetch repository data
+            return parts[0], parts[1]
+        raise ValueError(f"Invalid GitHub URL format: {repo_url}")
+    raise ValueError(f"Invalid GitHub URL: {repo_url}")
+
+def count_open_items(response):
+    """Number of open items behind a per_page=1 listing, read from its Link header"""
+    if response.status_code != 200:
+        return 0
+    # Get total count from Link header if available
+    link_header = response.headers.get('Link', '')
+    if 'rel="last"' in link_header:
+        # Extract the page number from the last link
+        match = re.search(r'page=(\d+)>; rel="last"', link_header)
+        return int(match.group(1)) if match else 0
+    return len(response.json())
+
+def commits_window_start():
+    """Start of the 7-day window whose commits are counted"""
+    return datetime.utcnow() - timedelta(days=7)
+
+def request_repository_data(repo_url, session, executor):
+    """
+    Start the four independent API requests for a repository (metadata,
+    commits, pulls, issues) on the executor and return (owner, repo, futures).
+    ``session`` is anything with a requests-style ``get``, such as a
+    GitHubHTTPCache.
+    """
+    owner, repo = parse_repository_url(repo_url)
     api_url = f"https://api.github.com/repos/{owner}/{repo}"
-    response = requests.get(api_url, headers=headers)
     
+    # Recent commits, requested from midnight so the URL (and its cache entry)
+    # stays the same all day; pulls and issues are counted from one-item pages
+    since = commits_window_start().replace(hour=0, minute=0, second=0, microsecond=0)
+    commits_params = {
+        'since': since.isoformat() + 'Z',
+        'per_page': 100
+    }
+    count_params = {'state': 'open', 'per_page': 1}
+    
+    futures = {
+        'repo': executor.submit(session.get, api_url),
+        'commits': executor.submit(session.get, f"{api_url}/commits", params=commits_params),
+        'pulls': executor.submit(session.get, f"{api_url}/pulls", params=count_params),
+        'issues': executor.submit(session.get, f"{api_url}/issues", params=count_params),
+    }
+    return owner, repo, futures
+
+def build_repository_data(owner, repo, responses):
+    """Repository entry for github_repositories.json from its four API responses"""
+    response = responses['repo']
     if response.status_code == 404:
         raise ValueError(f"Repository not found: {owner}/{repo}")
     elif response.status_code != 200:
@@ -91,55 +157,22 @@ def fetch_repository_data(repo_url, headers):
     
     repo_data = response.json()
     
-    # Fetch recent commits (last 7 days)
-    commits_url = f"{api_url}/commits"
-    commits_params = {
-        'since': (datetime.utcnow() - timedelta(days=7)).isoformat() + 'Z',
-        'per_page': 100
-    }
-    
-    commits_response = requests.get(commits_url, headers=headers, params=commits_params)
+    commits_response = responses['commits']
     commits_data = commits_response.json() if commits_response.status_code == 200 else []
     
+    # Trim the day-aligned listing to exactly the last 7 days
+    cutoff = commits_window_start().isoformat() + 'Z'
+    commits_data = [
+        commit for commit in commits_data
+        if ((commit.get('commit') or {}).get('committer') or {}).get('date', cutoff) >= cutoff
+    ]
+    
     # Count unique contributors in the last 7 days
     contributors = set()
     for commit in commits_data:
         if commit.get('author') and commit['author'].get('login'):
             contributors.add(commit['author']['login'])
     
-    # Fetch pull requests count
-    prs_url = f"{api_url}/pulls"
-    prs_params = {'state': 'open', 'per_page': 1}
-    prs_response = requests.get(prs_url, headers=headers, params=prs_params)
-    prs_count = 0
-    if prs_response.status_code == 200:
-        # Get total count from Link header if available
-        link_header = prs_response.headers.get('Link', '')
-        if 'rel="last"' in link_header:
-            # Extract the page number from the last link
-            import re
-            match = re.search(r'page=(\d+)>; rel="last"', link_header)
-            if match:
-                prs_count = int(match.group(1))
-        else:
-            prs_count = len(prs_response.json())
-    
-    # Fetch issues count
-    issues_url = f"{api_url}/issues"
-    issues_params = {'state': 'open', 'per_page': 1}
-    issues_response = requests.get(issues_url, headers=headers, params=issues_params)
-    issues_count = 0
-    if issues_response.status_code == 200:
-        # Get total count from Link header if available
-        link_header = issues_response.headers.get('Link', '')
-        if 'rel="last"' in link_header:
-            import re
-            match = re.search(r'page=(\d+)>; rel="last"', link_header)
-            if match:
-                issues_count = int(match.group(1))
-        else:
-            issues_count = len(issues_response.json())
-    
     # Get appropriate icon based on repository name and language
     repo_name = repo_data['name']
     language = repo_data.get('language', '')
@@ -158,11 +191,16 @@ def fetch_repository_data(repo_url, headers):
         "stats": {
             "commits_7d": len(commits_data),
             "contributors_7d": len(contributors),
-            "pull_requests": prs_count,
-            "issues": issues_count
+            "pull_requests": count_open_items(responses['pulls']),
+            "issues": count_open_items(responses['issues'])
         }
     }
 
+def fetch_repository_data(repo_url, session, executor):
+    """Fetch repository data from GitHub API, its four requests running in parallel"""
+    owner, repo, futures = request_repository_data(repo_url, session, executor)
+    return build_repository_data(owner, repo, {name: future.result() for name, future in futures.items()})
+
 def get_repository_icon(repo_name, language):
     """Get appropriate icon for repository type"""
     repo_lower = repo_name.lower()
@@ -205,65 +243,93 @@ def get_repository_icon(repo_name, language):
     else:
         return "💻"
 
-def main():
-    """Main function to generate GitHub data"""
-    print("🚀 Generating GitHub Intelligence Data...")
+def generate_github_data():
+    """
+    Fetch data for every configured repository, save it to
+    data/github_repositories.json and return it (None if nothing was fetched).
+    Raises ValueError when GitHub credentials are missing or invalid.
+    """
+    workers = get_github_workers()
+    session = create_github_session(workers)
     
-    try:
-        # Check GitHub credentials first
-        headers = check_github_credentials()
-        
-        # Load config
-        config = load_github_config()
-        if not config:
-            print("❌ Failed to load GitHub config")
-            return
-        
-        repository_urls = config.get('repositories', [])
-        if not repository_urls:
-            print("⚠️  No repository URLs found in config. Please add repository URLs to data/github_config.json")
-            print("Example format:")
-            print('  "repositories": [')
-            print('    "https://github.com/ethereum/go-ethereum",')
-            print('    "https://github.com/ethereum/solidity"')
-            print('  ]')
-            return
-        
-        print(f"📊 Fetching data for {len(repository_urls)} repositories...")
+    # Check GitHub credentials first
+    headers = check_github_credentials(session)
+    session.headers.update(headers)
+    
+    # Unchanged resources are revalidated with ETags rather than downloaded again
+    cache = open_github_cache(session)
+    
+    # Load config
+    config = load_github_config()
+    if not config:
+        print("❌ Failed to load GitHub config")
+        return None
+    
+    repository_urls = config.get('repositories', [])
+    if not repository_urls:
+        print("⚠️  No repository URLs found in config. Please add repository URLs to data/github_config.json")
+        print("Example format:")
+        print('  "repositories": [')
+        print('    "https://github.com/ethereum/go-ethereum",')
+        print('    "https://github.com/ethereum/solidity"')
+        print('  ]')
+        return None
+    
+    print(f"📊 Fetching data for {len(repository_urls)} repositories ({workers} requests at a time)...")
+    
+    # Every repository's requests are queued on one bounded pool up front,
+    # so they all overlap; results are then collected in config order
+    repositories = []
+    with session, ThreadPoolExecutor(max_workers=workers) as executor:
+        started = []
+        for repo_url in repository_urls:
+            try:
+                started.append((repo_url, request_repository_data(repo_url, cache, executor)))
+            except Exception as e:
+                print(f"❌ Error fetching data for {repo_url}: {e}")
         
-        repositories = []
-        for i, repo_url in enumerate(repository_urls, 1):
+        for i, (repo_url, (owner, repo, futures)) in enumerate(started, 1):
             try:
-                print(f"📄 Fetching data for repository {i}/{len(repository_urls)}: {repo_url}")
-                repo_data = fetch_repository_data(repo_url, headers)
+                responses = {name: future.result() for name, future in futures.items()}
+                repo_data = build_repository_data(owner, repo, responses)
                 repositories.append(repo_data)
-                print(f"✅ Successfully fetched data for {repo_data['name']}")
+                print(f"✅ Fetched repository {i}/{len(started)}: {repo_data['name']}")
             except Exception as e:
                 print(f"❌ Error fetching data for {repo_url}: {e}")
                 continue
-        
-        if not repositories:
-            print("❌ No repositories were successfully fetched")
-            return
-        
-        # Create the final data structure
-        data = {
-            "generated_at": datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
-            "total_repositories": len(repositories),
-            "repositories": repositories
-        }
-        
-        # Save the data
-        output_file = Path('data/github_repositories.json')
-        output_file.parent.mkdir(exist_ok=True)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        
-        print(f"✅ Generated GitHub data for {len(repositories)} repositories")
-        print(f"📁 Saved to: {output_file}")
-        
-        return data
+    
+    cache.save()
+    print(f"🗄️  GitHub cache: {cache.summary()}")
+    
+    if not repositories:
+        print("❌ No repositories were successfully fetched")
+        return None
+    
+    # Create the final data structure
+    data = {
+        "generated_at": datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        "total_repositories": len(repositories),
+        "repositories": repositories
+    }
+    
+    # Save the data
+    output_file = Path('data/github_repositories.json')
+    output_file.parent.mkdir(exist_ok=True)
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    
+    print(f"✅ Generated GitHub data for {len(repositories)} repositories")
+    print(f"📁 Saved to: {output_file}")
+    
+    return data
+
+def main():
+    """Main function to generate GitHub data"""
+    print("🚀 Generating GitHub Intelligence Data...")
+    
+    try:
+        return generate_github_data()
         
     except ValueError as e:
         print(f"❌ Configuration error: {e}")
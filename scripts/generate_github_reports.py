@@ -8,8 +8,14 @@ import os
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
+from build_manifest import BuildManifest, source_version
+from templating import render_to_file, publish_stylesheet, TEMPLATE_SOURCES
 import json
 
+# Fingerprints of the report pages' inputs, for skipping unchanged days
+MANIFEST_PATH = 'website/github_reports/.manifest.json'
+TEMPLATE_VERSION = source_version(__file__, *TEMPLATE_SOURCES)
+
 def get_repository_icon(repo_name, language):
     """Get appropriate icon for repository type"""
     repo_lower = repo_name.lower()
@@ -368,110 +374,29 @@ def generate_github_report_page(repo_data, start_date, end_date, output_dir='web
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Generate HTML
-    current_time = datetime.utcnow().strftime('%Y-%m-%d %H%MZ')
-    repo_icon = get_repository_icon(repo_data['name'], repo_data.get('language', ''))
-    
-    # Format date range for display
-    date_range = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
-    
-    html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <title>Wartime Milady CEO - {repo_data['name']} Report ({date_range})</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&family=Inter:wght@400;500;700&display=swap" rel="stylesheet">
-    <style>
-{generate_github_report_css()}
-    </style>
-</head>
-<body>
-    <div class="scan-lines"></div>
-    <header class="site-header">
-        <div class="header-content">
-            <div class="repo-icon">
-                {repo_icon}
-            </div>
-            <div class="header-text">
-                <h1 class="site-title">{repo_data['name']}</h1>
-                <p class="site-subtitle">GitHub Intelligence Report - {date_range}</p>
-                <div class="status-bar">
-                    <span class="timestamp">{current_time}</span>
-                    <span class="status-indicator" aria-live="polite">SYSTEMS ONLINE</span>
-                </div>
-            </div>
-        </div>
-    </header>
-    
-    <main class="main-content">
-        <a href="../github.html" class="back-link">← BACK TO GITHUB INTELLIGENCE</a>
-        
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-value">{repo_data['stats']['commits_7d']}</div>
-                <div class="stat-label">Commits (7d)</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">{repo_data['stats']['contributors_7d']}</div>
-                <div class="stat-label">Contributors (7d)</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">{repo_data['stats']['pull_requests']}</div>
-                <div class="stat-label">Pull Requests</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">{repo_data['stats']['issues']}</div>
-                <div class="stat-label">Open Issues</div>
-            </div>
-        </div>
-        
-        <div class="repo-info-section">
-            <h2 class="section-title">Repository Information</h2>
-            <div class="repo-description">{repo_data.get('description', 'No description available')}</div>
-            
-            <div class="repo-meta">
-                <div class="meta-item">
-                    <span class="meta-label">Language:</span>
-                    <span class="meta-value">{repo_data.get('language', 'Unknown')}</span>
-                </div>
-                <div class="meta-item">
-                    <span class="meta-label">Stars:</span>
-                    <span class="meta-value">{repo_data.get('stars', 0):,}</span>
-                </div>
-                <div class="meta-item">
-                    <span class="meta-label">Forks:</span>
-                    <span class="meta-value">{repo_data.get('forks', 0):,}</span>
-                </div>
-                <div class="meta-item">
-                    <span class="meta-label">Full Name:</span>
-                    <span class="meta-value">{repo_data.get('full_name', repo_data['name'])}</span>
-                </div>
-            </div>
-        </div>
-    </main>
-    
-    <footer class="site-footer">
-        <p>Generated by Wartime Milady CEO Intelligence Platform</p>
-        <p>Report generated: {current_time}</p>
-    </footer>
-</body>
-</html>'''
-    
     # Write to file with date-based filename
-    safe_filename = repo_data['id'].replace('/', '_').replace('-', '_')
-    date_suffix = start_date.strftime('%Y%m%d')
-    output_file = output_path / f"report_{safe_filename}_{date_suffix}.html"
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+    output_file = output_path / github_report_filename(repo_data, start_date)
+    render_to_file(
+        'github_report.html',
+        output_file,
+        stylesheet=publish_stylesheet(
+            'github-report', generate_github_report_css(), output_path.parent / 'assets', output_path
+        ),
+        current_time=datetime.utcnow().strftime('%Y-%m-%d %H%MZ'),
+        header_icon=get_repository_icon(repo_data['name'], repo_data.get('language', '')),
+        repo_data=repo_data,
+        date_range=f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
+    )
     
     print(f"Generated GitHub report: {output_file}")
     return output_file
 
-def generate_daily_github_reports_for_repo(repo_data, days_back=7):
+def github_report_filename(repo_data, start_date):
+    """File name of a repository's report for the day starting at start_date"""
+    safe_filename = repo_data['id'].replace('/', '_').replace('-', '_')
+    return f"report_{safe_filename}_{start_date.strftime('%Y%m%d')}.html"
+
+def generate_daily_github_reports_for_repo(repo_data, days_back=7, output_dir='website/github_reports', manifest=None):
     """Generate daily reports for the last N days for a specific repository"""
     reports = []
     
@@ -480,8 +405,15 @@ def generate_daily_github_reports_for_repo(repo_data, days_back=7):
         end_date = datetime.now() - timedelta(days=i)
         start_date = end_date - timedelta(days=1)
         
-        # Generate report for this day
-        report_file = generate_github_report_page(repo_data, start_date, end_date)
+        # Generate report for this day unless the repo data and dates shown are unchanged
+        report_file = Path(output_dir) / github_report_filename(repo_data, start_date)
+        fingerprint = BuildManifest.fingerprint(
+            TEMPLATE_VERSION, repo_data, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+        )
+        if not (manifest and manifest.is_current(report_file, fingerprint)):
+            report_file = generate_github_report_page(repo_data, start_date, end_date, output_dir)
+            if report_file and manifest:
+                manifest.record(report_file, fingerprint)
         if report_file:
             reports.append({
                 'date': start_date.strftime('%Y-%m-%d'),
@@ -494,52 +426,61 @@ def generate_daily_github_reports_for_repo(repo_data, days_back=7):
     
     return reports
 
-def generate_all_github_reports():
-    """Generate daily report pages for all monitored GitHub repositories"""
-    # Read repositories data from the JSON file
+def load_repositories_data():
+    """Load data/github_repositories.json as written by generate_github_data.py"""
     repos_file = Path('data/github_repositories.json')
     
     if not repos_file.exists():
-        print("Error: github_repositories.json not found. Run generate_github_data.py first.")
-        return
+        raise FileNotFoundError("github_repositories.json not found. Run generate_github_data.py first.")
+    
+    with open(repos_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def generate_all_github_reports(repos_data=None):
+    """
+    Generate daily report pages for all monitored GitHub repositories and
+    return the reports metadata. ``repos_data`` defaults to
+    data/github_repositories.json.
+    """
+    if repos_data is None:
+        repos_data = load_repositories_data()
+    
+    print(f"📊 Generating daily reports for {len(repos_data['repositories'])} repositories...")
+    
+    all_reports = {}
+    manifest = BuildManifest(MANIFEST_PATH)
     
+    for repo in repos_data['repositories']:
+        try:
+            print(f"📄 Generating daily reports for {repo['name']} (ID: {repo['id']})")
+            
+            # Generate daily reports for this repository
+            reports = generate_daily_github_reports_for_repo(repo, days_back=7, manifest=manifest)
+            # Use the repo ID as the metadata key
+            metadata_key = repo['id'].replace('/', '_')
+            all_reports[metadata_key] = {
+                'name': repo['name'],
+                'reports': reports
+            }
+            
+        except Exception as e:
+            print(f"Error generating reports for repo {repo['name']} (ID: {repo['id']}): {e}")
+    manifest.save()
+    
+    # Save reports metadata for the popup interface
+    metadata_file = Path('website/github_reports/metadata.json')
+    metadata_file.parent.mkdir(exist_ok=True)
+    
+    with open(metadata_file, 'w', encoding='utf-8') as f:
+        json.dump(all_reports, f, indent=2, default=str)
+    
+    print(f"✅ Generated daily reports for {len(repos_data['repositories'])} repositories ({manifest.summary()})")
+    print(f"📁 Reports metadata saved to: {metadata_file}")
+    return all_reports
+
+if __name__ == "__main__":
     try:
-        with open(repos_file, 'r', encoding='utf-8') as f:
-            repos_data = json.load(f)
-        
-        print(f"📊 Generating daily reports for {len(repos_data['repositories'])} repositories...")
-        
-        all_reports = {}
-        
-        for repo in repos_data['repositories']:
-            try:
-                print(f"📄 Generating daily reports for {repo['name']} (ID: {repo['id']})")
-                
-                # Generate daily reports for this repository
-                reports = generate_daily_github_reports_for_repo(repo, days_back=7)
-                # Use the repo ID as the metadata key
-                metadata_key = repo['id'].replace('/', '_')
-                all_reports[metadata_key] = {
-                    'name': repo['name'],
-                    'reports': reports
-                }
-                
-            except Exception as e:
-                print(f"Error generating reports for repo {repo['name']} (ID: {repo['id']}): {e}")
-        
-        # Save reports metadata for the popup interface
-        metadata_file = Path('website/github_reports/metadata.json')
-        metadata_file.parent.mkdir(exist_ok=True)
-        
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(all_reports, f, indent=2, default=str)
-        
-        print(f"✅ Generated daily reports for {len(repos_data['repositories'])} repositories")
-        print(f"📁 Reports metadata saved to: {metadata_file}")
-        
+        generate_all_github_reports()
     except Exception as e:
         print(f"Error reading repositories data: {e}")
-        return
-
-if __name__ == "__main__":
-    generate_all_github_reports() 
\ No newline at end of file
+        sys.exit(1)
@@ -4,69 +4,49 @@ Generate channels.json data for Wartime Milady CEO Intelligence Platform
 Extracts data from Supabase database and formats it for the static site generator.
 """
 
-import os
 import sys
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from supabase import create_client, Client
+from telegram_data import get_backend
 
-# Initialize Supabase client
-supabase_url = os.getenv('SUPABASE_URL')
-supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-
-if not supabase_url or not supabase_key:
-    print("Error: SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY environment variables are required")
-    sys.exit(1)
-
-supabase: Client = create_client(supabase_url, supabase_key)
-
-def get_chat_activity_24h(chat_id):
+def get_chats_activity(chat_ids):
     """
-    Get 24-hour activity statistics for a chat
+    Get 24-hour activity statistics for all given chats in one query
     """
-    cutoff_time = datetime.now() - timedelta(hours=24)    # Get messages from last 24 hours
-    messages_response = supabase.table('messages_v1').select(
-        "id,from_user_id, date"
-    ).eq('chat_id', chat_id).gte('date', cutoff_time.isoformat()).execute()
-    
-    messages = messages_response.data
-    
-    # Get unique participants
-    unique_users = set(msg['from_user_id'] for msg in messages if msg['from_user_id'])    # Get previous 24 hours for comparison
-    prev_cutoff = cutoff_time - timedelta(hours=24)
-    prev_messages_response = supabase.table('messages_v1').select(
-        "id,from_user_id, date"
-    ).eq('chat_id', chat_id).gte('date', prev_cutoff.isoformat()).lt('date', cutoff_time.isoformat()).execute()
-    
-    prev_messages = prev_messages_response.data
-    prev_unique_users = set(msg['from_user_id'] for msg in prev_messages if msg['from_user_id'])
-    
-    # Calculate change percentages
-    current_count = len(messages)
-    prev_count = len(prev_messages)
-    
-    if prev_count > 0:
-        message_change = ((current_count - prev_count) / prev_count) * 100
-    else:
-        message_change = 100 if current_count > 0 else 0
-    current_users = len(unique_users)
-    prev_users = len(prev_unique_users)
-    
-    if prev_users > 0:
-        user_change = ((current_users - prev_users) / prev_users) * 100
-    else:
-        user_change = 100 if current_users > 0 else 0
-    
-    # Determine trend based on message count
-    trend = "up" if message_change > 0 else "down"
+    cutoff_time = datetime.now() - timedelta(hours=24)
+    counts_by_chat = get_backend().get_chats_activity_24h(chat_ids, cutoff_time)
+    
+    activity = {}
+    for chat_id in chat_ids:
+        counts = counts_by_chat.get(chat_id, {})
+        current_count = counts.get('messages_24h', 0)
+        prev_count = counts.get('prev_messages_24h', 0)
+        current_users = counts.get('participants_24h', 0)
+        prev_users = counts.get('prev_participants_24h', 0)
+        
+        # Calculate change percentages
+        if prev_count > 0:
+            message_change = ((current_count - prev_count) / prev_count) * 100
+        else:
+            message_change = 100 if current_count > 0 else 0
+        
+        if prev_users > 0:
+            user_change = ((current_users - prev_users) / prev_users) * 100
+        else:
+            user_change = 100 if current_users > 0 else 0
+        
+        # Determine trend based on message count
+        trend = "up" if message_change > 0 else "down"
+        
+        activity[chat_id] = {
+            "messages_24h": current_count,
+            "participants_24h": current_users,
+            "change_percent": round(message_change, 1),
+            "trend": trend
+        }
     
-    return {
-        "messages_24h": current_count,
-        "participants_24h": current_users,
-        "change_percent": round(message_change, 1),
-        "trend": trend
-    }
+    return activity
 
 def get_chat_icon(chat_type, title):
     """
@@ -115,21 +95,12 @@ def get_active_chats():
     # Get chats that have had messages in the last 7 days
     cutoff_time = datetime.now() - timedelta(days=7)
     
-    # Get unique chat IDs from recent messages
-    messages_response = supabase.table('messages_v1').select(
-      "chat_id"
-    ).gte('date', cutoff_time.isoformat()).execute()
-    
-    chat_ids = set(msg['chat_id'] for msg in messages_response.data if msg['chat_id'])
-    
-    if not chat_ids:
-        return []
-    # Get chat details - use select('*') like the working script
-    chats_response = supabase.table('chats_v1').select('*').in_('chat_id', list(chat_ids)).execute()
+    # Get chat details for chats whose last message is within the window
+    active_chats = get_backend().get_chats_active_since(cutoff_time)
     
     # Filter out private chats and chats with no title
     filtered_chats = []
-    for chat in chats_response.data:
+    for chat in active_chats:
         # Skip private chats (DMs)
         if chat.get('chat_type') == 'private':
             continue
@@ -156,11 +127,13 @@ def generate_channels_data():
     channels = []
     now = datetime.now()
     
+    # Get 24-hour activity stats for every chat in a single round trip
+    activity_by_chat = get_chats_activity([chat['chat_id'] for chat in active_chats])
+    
     for chat in active_chats:
         print(f"📈 Processing chat: {chat.get('title', 'Unknown')}")
         
-        # Get 24-hour activity stats
-        activity = get_chat_activity_24h(chat['chat_id'])
+        activity = activity_by_chat[chat['chat_id']]
         
         # Skip chats with no recent activity
         if activity['messages_24h'] == 0:
@@ -5,85 +5,117 @@ Generates detailed report pages for each monitored Telegram chat.
 """
 
 import os
+import shutil
 import sys
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
-from supabase import create_client, Client
+from telegram_data import get_backend, ConfigurationError, summarize_hourly_stats, ceil_hour
+from build_manifest import BuildManifest, source_version
+from templating import render_to_file, publish_stylesheet, military_time, TEMPLATE_SOURCES
+from report_index import ReportIndex, index_legacy_reports
 import json
 
-# Initialize Supabase client
-supabase_url = os.getenv('SUPABASE_URL')
-supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+# Number of chats fetched and rendered in parallel (set REPORT_WORKERS)
+DEFAULT_REPORT_WORKERS = 4
 
-if not supabase_url or not supabase_key:
-    print("Error: SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY environment variables are required")
-    sys.exit(1)
+# UTC days each chat has reports for; metadata lists only these days
+REPORT_DAYS = 7
 
-supabase: Client = create_client(supabase_url, supabase_key)
+# Fingerprints of the report pages' inputs, for skipping unchanged days
+MANIFEST_PATH = 'website/reports/.manifest.json'
+METADATA_PATH = 'website/reports/metadata.json'
+# Append-only log of every report built; metadata.json is compacted from it
+REPORT_INDEX_PATH = 'website/reports/report_index.jsonl'
+# One small metadata file per chat, fetched by telegram.html's report selector
+REPORT_INDEX_DIR = 'website/reports/index'
+TEMPLATE_VERSION = source_version(__file__, *TEMPLATE_SOURCES)
+
+# Each day's messages are archived as JSON pages of this many messages,
+# under <reports dir>/messages/<report name>/; the first is also in the HTML
+MESSAGE_ARCHIVE_DIR = 'messages'
+MESSAGE_PAGE_SIZE = 200
 
 def get_chat_messages(chat_id, start_date, end_date, limit=100):
-    """Get messages from a specific chat within a date range"""
-    response = supabase.table('messages_v1').select(
-        'id, telegram_message_id, from_user_id, date, text, message_type, reply_to_message_id'
-    ).eq('chat_id', chat_id).gte('date', start_date.isoformat()).lt('date', end_date.isoformat()).order('date', desc=True).limit(limit).execute()
-    
-    return response.data
+    """Get messages from a specific chat within a date range, newest first (limit=None for all)"""
+    return get_backend().get_chat_messages(chat_id, start_date, end_date, limit)
 
 def get_chat_info(chat_id):
     """Get chat information"""
-    response = supabase.table('chats_v1').select('*').eq('chat_id', chat_id).execute()
-    return response.data[0] if response.data else None
+    chats = get_backend().get_chats([chat_id])
+    return chats[0] if chats else None
 
 def get_users_data(user_ids):
     """Get user data for the given user IDs"""
     if not user_ids:
         return {}
     
-    response = supabase.table('users_v1').select('*').in_('user_id', list(user_ids)).execute()
     users = {}
-    for user in response.data:
+    for user in get_backend().get_users(user_ids):
         users[user['user_id']] = user
     return users
 
 def get_chat_stats(chat_id, start_date, end_date):
     """Get comprehensive statistics for a chat within a date range"""
-    # Get messages
-    messages_response = supabase.table('messages_v1').select(
-        'id, from_user_id, message_type, date'
-    ).eq('chat_id', chat_id).gte('date', start_date.isoformat()).lt('date', end_date.isoformat()).execute()
-    
-    messages = messages_response.data
+    # Aggregated server-side so busy chats don't ship every message row
+    return get_backend().get_chat_window_stats(chat_id, start_date, end_date)
+
+def get_chat_hourly(chat_id, start_date, end_date):
+    """Get hourly rollup rows for a chat within a date range"""
+    return get_backend().get_chat_hourly_stats(chat_id, start_date, end_date)
+
+def load_chat_snapshot(chat_id, start_date, end_date, with_messages=True):
+    """
+    Fetch everything needed to render a chat's reports for a date range at once:
+    the chat row, every message, their authors and the hourly rollups.
+    With ``with_messages=False`` the messages and authors are left to be
+    loaded by ``load_snapshot_messages`` once a page actually needs them.
+    """
+    chat_info = get_chat_info(chat_id)
+    if not chat_info:
+        return None
     
-    # Calculate stats
-    unique_users = set(msg['from_user_id'] for msg in messages if msg['from_user_id'])
-    message_types = {}
-    hourly_activity = {}
+    snapshot = {
+        'chat_id': chat_id,
+        'start_date': start_date,
+        'end_date': end_date,
+        'chat_info': chat_info,
+        'messages': None,
+        'users': None,
+        'hourly_rows': get_chat_hourly(chat_id, start_date, end_date)
+    }
+    if with_messages:
+        load_snapshot_messages(snapshot)
+    return snapshot
+
+def load_snapshot_messages(snapshot):
+    """Fetch a snapshot's messages and their authors if not loaded yet"""
+    if snapshot['messages'] is not None:
+        return
     
-    for msg in messages:
-        # Message types
-        msg_type = msg.get('message_type', 'text')
-        message_types[msg_type] = message_types.get(msg_type, 0) + 1
-        
-        # Hourly activity
+    messages = get_chat_messages(snapshot['chat_id'], snapshot['start_date'], snapshot['end_date'], limit=None)
+    user_ids = set(msg['from_user_id'] for msg in messages if msg['from_user_id'])
+    snapshot['messages'] = messages
+    snapshot['users'] = get_users_data(user_ids)
+
+def slice_snapshot(snapshot, start_date, end_date, limit=None):
+    """
+    Get the messages (newest first, up to limit) and the stats for one window of a snapshot.
+    Windows use the same whole-hour boundaries as the hourly rollups so the
+    listed messages and the counts agree.
+    """
+    lower = ceil_hour(start_date)
+    upper = ceil_hour(end_date)
+    messages = []
+    for msg in snapshot['messages']:
         msg_time = datetime.fromisoformat(msg['date'].replace('Z', '+00:00'))
-        hour = msg_time.strftime('%H')
-        hourly_activity[hour] = hourly_activity.get(hour, 0) + 1
+        if lower <= msg_time < upper:
+            messages.append(msg)
+            if len(messages) == limit:
+                break
     
-    return {
-        'total_messages': len(messages),
-        'unique_participants': len(unique_users),
-        'message_types': message_types,
-        'hourly_activity': hourly_activity,
-        'last_message': max([msg['date'] for msg in messages]) if messages else None
-    }
-
-def format_military_time(timestamp):
-    """Format timestamp in military time"""
-    try:
-        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        return dt.strftime('%Y-%m-%d %H%MZ')
-    except Exception:
-        return timestamp
+    return messages, summarize_hourly_stats(snapshot['hourly_rows'], start_date, end_date)
 
 def get_chat_icon(chat_type, title):
     """Get appropriate icon for chat type"""
@@ -456,209 +488,325 @@ h1.site-title {
 }
 '''
 
-def generate_report_page(chat_id, start_date, end_date, output_dir='website/reports'):
-    """Generate a detailed report page for a specific chat and date range"""
+def iter_report_messages(messages, users_data):
+    """Yield messages as the report shows them, one at a time"""
+    for msg in messages:
+        user = users_data.get(msg['from_user_id'], {})
+        author_name = user.get('first_name', 'Unknown User')
+        if user.get('last_name'):
+            author_name += f" {user['last_name']}"
+        yield {
+            'author': author_name,
+            'time': military_time(msg['date']),
+            'text': msg.get('text') or '[No text content]',
+            'type': msg.get('message_type') or 'text',
+        }
+
+def message_page_filename(page):
+    return f"page-{page:04d}.json"
+
+def write_message_archive(report_messages, archive_dir, archive_url, page_size=MESSAGE_PAGE_SIZE):
+    """
+    Write a day's messages, newest first, as paged JSON files in archive_dir
+    and return the first page's messages and the number of pages. Pages are
+    written as the messages stream in; each names the URL of the next, older
+    page (relative to the report), so the page can follow them on scroll.
+    """
+    # Drop the pages of an earlier build of this day before writing new ones
+    if archive_dir.exists():
+        shutil.rmtree(archive_dir)
+    archive_dir.mkdir(parents=True)
     
-    # Get chat data
-    chat_info = get_chat_info(chat_id)
-    if not chat_info:
-        print(f"Chat {chat_id} not found")
-        return
+    def write_page(page, messages, has_next):
+        payload = {
+            'page': page,
+            'next': f"{archive_url}/{message_page_filename(page + 1)}" if has_next else None,
+            # author, time, text, type
+            'messages': [[m['author'], m['time'], m['text'], m['type']] for m in messages],
+        }
+        with open(archive_dir / message_page_filename(page), 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
     
-    # Get messages
-    messages = get_chat_messages(chat_id, start_date, end_date, limit=200)
+    first_page = None
+    page, buffered = 0, []
+    for message in report_messages:
+        if len(buffered) == page_size:
+            # A page is only written once a later message proves it has a successor
+            page += 1
+            write_page(page, buffered, has_next=True)
+            first_page = first_page or buffered
+            buffered = []
+        buffered.append(message)
     
-    # Get user data
-    user_ids = set(msg['from_user_id'] for msg in messages if msg['from_user_id'])
-    users_data = get_users_data(user_ids)
+    if buffered or not page:
+        page += 1
+        write_page(page, buffered, has_next=False)
+        first_page = first_page or buffered
+    return first_page, page
+
+def generate_report_page(chat_id, start_date, end_date, output_dir='website/reports', snapshot=None):
+    """
+    Generate a detailed report page for a specific chat and date range. The
+    page lists the newest messages; all of them are archived as paged JSON
+    next to it and loaded as the reader scrolls.
+    """
+    
+    # Get chat data unless the caller already loaded a covering snapshot
+    if snapshot is None:
+        snapshot = load_chat_snapshot(chat_id, start_date, end_date)
+    if not snapshot:
+        print(f"Chat {chat_id} not found")
+        return
     
-    # Get statistics
-    stats = get_chat_stats(chat_id, start_date, end_date)
+    load_snapshot_messages(snapshot)
+    chat_info = snapshot['chat_info']
+    messages, stats = slice_snapshot(snapshot, start_date, end_date)
     
     # Create output directory
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Generate HTML
-    current_time = datetime.utcnow().strftime('%Y-%m-%d %H%MZ')
-    chat_icon = get_chat_icon(chat_info.get('chat_type'), chat_info.get('title'))
-    
-    # Format date range for display
-    date_range = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
-    
-    html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <title>Wartime Milady CEO - {chat_info.get('title', 'Unknown Chat')} Report ({date_range})</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&family=Inter:wght@400;500;700&display=swap" rel="stylesheet">
-    <style>
-{generate_report_css()}
-    </style>
-</head>
-<body>
-    <div class="scan-lines"></div>
-    <header class="site-header">
-        <div class="header-content">
-            <div class="chat-icon">
-                {chat_icon}
-            </div>
-            <div class="header-text">
-                <h1 class="site-title">{chat_info.get('title', 'Unknown Chat')}</h1>
-                <p class="site-subtitle">Intelligence Report - {date_range}</p>
-                <div class="status-bar">
-                    <span class="timestamp">{current_time}</span>
-                    <span class="status-indicator" aria-live="polite">SYSTEMS ONLINE</span>
-                </div>
-            </div>
-        </div>
-    </header>
-    
-    <main class="main-content">
-        <a href="../index.html" class="back-link">← BACK TO COMMAND CENTER</a>
-        
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-value">{stats['total_messages']}</div>
-                <div class="stat-label">Total Messages</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">{stats['unique_participants']}</div>
-                <div class="stat-label">Active Participants</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">{len(stats['message_types'])}</div>
-                <div class="stat-label">Message Types</div>
-            </div>
-        </div>
-        
-        <div class="messages-section">
-            <h2 class="section-title">Recent Messages</h2>
-            <p class="section-note">Showing up to 200 most recent messages from this period. Total messages: {stats['total_messages']}</p>
-            <div class="message-list">
-'''
+    # Archive every message of the window in pages alongside the report
+    output_file = output_path / report_filename(chat_id, start_date)
+    archive_url = f"{MESSAGE_ARCHIVE_DIR}/{output_file.stem}"
+    first_page, page_count = write_message_archive(
+        iter_report_messages(messages, snapshot['users']), output_path / archive_url, archive_url
+    )
     
-    # Add messages
-    for msg in messages:
-        user = users_data.get(msg['from_user_id'], {})
-        author_name = user.get('first_name', 'Unknown User')
-        if user.get('last_name'):
-            author_name += f" {user['last_name']}"
-        
-        message_time = format_military_time(msg['date'])
-        message_text = msg.get('text', '[No text content]')
-        message_type = msg.get('message_type', 'text')
-        
-        html += f'''
-                <div class="message-item">
-                    <div class="message-header">
-                        <span class="message-author">{author_name}</span>
-                        <span class="message-time">{message_time}</span>
-                    </div>
-                    <div class="message-text">{message_text}</div>
-                    <span class="message-type-badge">{message_type}</span>
-                </div>
-'''
-    
-    html += '''
-            </div>
-        </div>
-    </main>
-    
-    <footer class="site-footer">
-        <p>Generated by Wartime Milady CEO Intelligence Platform</p>
-        <p>Report generated: ''' + current_time + '''</p>
-    </footer>
-</body>
-</html>'''
-    
-    # Write to file with date-based filename
-    safe_filename = str(chat_id).replace('-', '')  # Remove minus sign for filename
-    date_suffix = start_date.strftime('%Y%m%d')
-    output_file = output_path / f"report_{safe_filename}_{date_suffix}.html"
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+    # Stream the page into its date-based file as it renders
+    render_to_file(
+        'report.html',
+        output_file,
+        stylesheet=publish_stylesheet('report', generate_report_css(), output_path.parent / 'assets', output_path),
+        current_time=datetime.utcnow().strftime('%Y-%m-%d %H%MZ'),
+        header_icon=get_chat_icon(chat_info.get('chat_type'), chat_info.get('title')),
+        chat_info=chat_info,
+        date_range=f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
+        stats=stats,
+        messages=first_page,
+        next_page=f"{archive_url}/{message_page_filename(2)}" if page_count > 1 else None,
+    )
     
     print(f"Generated report: {output_file}")
     return output_file
 
-def generate_daily_reports_for_chat(chat_id, days_back=7):
-    """Generate daily reports for the last N days for a specific chat"""
-    reports = []
+def report_filename(chat_id, start_date):
+    """File name of a chat's report for the day starting at start_date"""
+    safe_filename = str(chat_id).replace('-', '')  # Remove minus sign for filename
+    return f"report_{safe_filename}_{start_date.strftime('%Y%m%d')}.html"
+
+def report_fingerprint(snapshot, start_date, end_date):
+    """
+    Fingerprint of a day report's inputs. The day's hourly rollups change
+    whenever a message in it is added, edited or deleted (through their
+    ``last_updated_at``), so they stand in for the messages themselves and
+    unchanged days are skipped without fetching any.
+    """
+    lower = ceil_hour(start_date)
+    upper = ceil_hour(end_date)
+    day_rows = [
+        row for row in snapshot['hourly_rows']
+        if lower <= datetime.fromisoformat(row['hour'].replace('Z', '+00:00')) < upper
+    ]
+    chat_info = snapshot['chat_info']
+    return BuildManifest.fingerprint(
+        TEMPLATE_VERSION, chat_info.get('title'), chat_info.get('chat_type'),
+        lower.isoformat(), upper.isoformat(), start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'),
+        day_rows
+    )
+
+def utc_day_windows(days_back, now):
+    """
+    (start, end) of the last N UTC calendar days, newest first. The first
+    window is today, which stays open until its end passes.
+    """
+    today = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return [(today - timedelta(days=i), today - timedelta(days=i - 1)) for i in range(days_back)]
+
+def report_retention_start(now=None):
+    """First day (YYYY-MM-DD) still listed in the reports metadata"""
+    oldest_start, _ = utc_day_windows(REPORT_DAYS, now or datetime.now(timezone.utc))[-1]
+    return oldest_start.strftime('%Y-%m-%d')
+
+def generate_daily_reports_for_chat(chat_id, days_back=REPORT_DAYS, output_dir='website/reports', manifest=None):
+    """
+    Generate daily reports for the last N UTC calendar days for a specific chat.
+    
+    Closed days are checked like open ones: messages can still be edited or
+    deleted after a day ends, and that changes the day's rollups and so its
+    fingerprint. Days whose fingerprint is unchanged are skipped.
+    """
+    now = datetime.now(timezone.utc)
+    windows = utc_day_windows(days_back, now)
+    
+    reports = [None] * len(windows)
+    pending = list(range(len(windows)))
+    
+    # Load the rollups for all the days once (24 rows a day); messages are
+    # only fetched (once, for all of them) if some day's page has to be rebuilt
+    snapshot = load_chat_snapshot(chat_id, windows[-1][0], windows[0][1], with_messages=False)
+    if not snapshot:
+        print(f"Chat {chat_id} not found")
+        pending = []
     
-    for i in range(days_back):
-        # Calculate date range for this day
-        end_date = datetime.now() - timedelta(days=i)
-        start_date = end_date - timedelta(days=1)
+    for i in pending:
+        start_date, end_date = windows[i]
         
         # Get statistics for this day
-        stats = get_chat_stats(chat_id, start_date, end_date)
+        stats = summarize_hourly_stats(snapshot['hourly_rows'], start_date, end_date)
         
-        # Generate report for this day
-        report_file = generate_report_page(chat_id, start_date, end_date)
+        # Generate report for this day unless its inputs are unchanged
+        report_file = Path(output_dir) / report_filename(chat_id, start_date)
+        fingerprint = report_fingerprint(snapshot, start_date, end_date)
+        if not (manifest and manifest.is_current(report_file, fingerprint)):
+            report_file = generate_report_page(chat_id, start_date, end_date, output_dir, snapshot=snapshot)
+            if report_file and manifest:
+                manifest.record(report_file, fingerprint)
         if report_file:
-            reports.append({
+            reports[i] = {
                 'date': start_date.strftime('%Y-%m-%d'),
                 'filename': report_file.name,
                 'start_date': start_date.isoformat(),
                 'end_date': end_date.isoformat(),
                 'total_messages': stats['total_messages'],
-                'unique_participants': stats['unique_participants']
-            })
+                'unique_participants': stats['unique_participants'],
+                'closed': end_date <= now,
+                'input_fingerprint': fingerprint
+            }
     
-    return reports
+    return [report for report in reports if report]
 
-def generate_all_reports():
-    """Generate daily report pages for all monitored chats"""
-    # Read channels data from the JSON file generated by the main script
+def get_report_workers():
+    """Get the number of chats to process in parallel"""
+    # Local mirror reads don't wait on the network, so workers would only queue
+    if not get_backend().parallel_reads:
+        return 1
+    try:
+        return max(1, int(os.getenv('REPORT_WORKERS', DEFAULT_REPORT_WORKERS)))
+    except ValueError:
+        return DEFAULT_REPORT_WORKERS
+
+def generate_channel_reports(channel, manifest=None):
+    """Generate daily reports for one channel; returns (metadata key, entry) or None"""
+    try:
+        chat_id = int(channel['id'])  # Convert string ID back to int
+        print(f"📄 Generating daily reports for {channel['name']} (ID: {chat_id})")
+        
+        # Generate daily reports for this chat
+        reports = generate_daily_reports_for_chat(
+            chat_id, days_back=REPORT_DAYS, manifest=manifest
+        )
+        # Use the chat ID without minus sign for the metadata key
+        metadata_key = str(chat_id).replace('-', '')
+        return metadata_key, {
+            'name': channel['name'],
+            'reports': reports
+        }
+        
+    except Exception as e:
+        print(f"Error generating reports for chat {channel['name']} (ID: {channel['id']}): {e}")
+        return None
+
+def load_channels_data():
+    """Load data/channels.json as written by generate_milady_data.py"""
     channels_file = Path('data/channels.json')
     
     if not channels_file.exists():
-        print("Error: channels.json not found. Run generate_milady_data.py first.")
-        return
+        raise FileNotFoundError("channels.json not found. Run generate_milady_data.py first.")
+    
+    with open(channels_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_report_indexes(all_reports, index_dir=REPORT_INDEX_DIR):
+    """
+    Write each chat's metadata entry to <index_dir>/<metadata key>.json so the
+    landing page can fetch one chat's reports instead of embedding them all.
+    Files whose content is unchanged are left alone; returns how many were written.
+    """
+    index_path = Path(index_dir)
+    index_path.mkdir(parents=True, exist_ok=True)
+    
+    written = 0
+    for metadata_key, entry in all_reports.items():
+        content = json.dumps(entry, default=str, sort_keys=True, separators=(',', ':'))
+        index_file = index_path / f"{metadata_key}.json"
+        if index_file.exists() and index_file.read_text(encoding='utf-8') == content:
+            continue
+        index_file.write_text(content, encoding='utf-8')
+        written += 1
+    return written
+
+def open_report_index(path=REPORT_INDEX_PATH):
+    """
+    Open the report index, dropping reports past the retention window. A
+    missing index is first backfilled from the report pages already on disk.
+    """
+    index = ReportIndex(path)
+    since = report_retention_start()
+    if not index.path.exists():
+        backfilled = index_legacy_reports(index, since)
+        print(f"🗂️  Report index created from {backfilled} existing report pages")
+    index.expire(since)
+    return index
+
+def save_reports_metadata(index):
+    """Compact the report index into metadata.json and the per-chat index files; returns the metadata"""
+    index.compact()
+    metadata = index.metadata()
+    metadata_file = Path(METADATA_PATH)
+    metadata_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(metadata_file, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2, default=str, sort_keys=True)
     
+    updated_indexes = write_report_indexes(metadata)
+    print(f"📁 Reports metadata saved to: {metadata_file} ({updated_indexes} per-chat indexes updated)")
+    return metadata
+
+def generate_all_reports(channels_data=None, workers=None):
+    """
+    Generate daily report pages for all monitored chats and return the
+    reports metadata. ``channels_data`` defaults to data/channels.json.
+    """
+    if channels_data is None:
+        channels_data = load_channels_data()
+    
+    workers = workers or get_report_workers()
+    print(f"📊 Generating daily reports for {len(channels_data['channels'])} channels ({workers} workers)...")
+    
+    manifest = BuildManifest(MANIFEST_PATH)
+    index = open_report_index()
+    build_channel = partial(generate_channel_reports, manifest=manifest)
+    
+    # Chats are fetched and rendered in parallel; map() hands results back
+    # in channels.json order so the index grows the same for any worker count
+    if workers == 1:
+        results = [build_channel(channel) for channel in channels_data['channels']]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(build_channel, channels_data['channels']))
+    manifest.save()
+    
+    # Only reports that are new or changed since the last run are appended
+    records = [
+        dict(report, chat=metadata_key, name=entry['name'])
+        for metadata_key, entry in filter(None, results)
+        for report in entry['reports']
+    ]
+    appended = index.append(records)
+    
+    print(f"✅ Generated daily reports for {len(channels_data['channels'])} channels ({manifest.summary()})")
+    print(f"🗂️  Report index: {appended} new or changed entries")
+    return save_reports_metadata(index)
+
+if __name__ == "__main__":
     try:
-        with open(channels_file, 'r', encoding='utf-8') as f:
-            channels_data = json.load(f)
-        
-        print(f"📊 Generating daily reports for {len(channels_data['channels'])} channels...")
-        
-        all_reports = {}
-        
-        for channel in channels_data['channels']:
-            try:
-                chat_id = int(channel['id'])  # Convert string ID back to int
-                print(f"📄 Generating daily reports for {channel['name']} (ID: {chat_id})")
-                
-                # Generate daily reports for this chat
-                reports = generate_daily_reports_for_chat(chat_id, days_back=7)
-                # Use the chat ID without minus sign for the metadata key
-                metadata_key = str(chat_id).replace('-', '')
-                all_reports[metadata_key] = {
-                    'name': channel['name'],
-                    'reports': reports
-                }
-                
-            except Exception as e:
-                print(f"Error generating reports for chat {channel['name']} (ID: {channel['id']}): {e}")
-        
-        # Save reports metadata for the popup interface
-        metadata_file = Path('website/reports/metadata.json')
-        metadata_file.parent.mkdir(exist_ok=True)
-        
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(all_reports, f, indent=2, default=str)
-        
-        print(f"✅ Generated daily reports for {len(channels_data['channels'])} channels")
-        print(f"📁 Reports metadata saved to: {metadata_file}")
-        
+        get_backend()
+    except ConfigurationError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    try:
+        generate_all_reports()
     except Exception as e:
         print(f"Error reading channels data: {e}")
-        return
-
-if __name__ == "__main__":
-    generate_all_reports() 
\ No newline at end of file
+        sys.exit(1) 
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Persistent conditional-request cache for the GitHub API.
+
+Successful responses are stored on disk with their ``ETag`` and
+``Last-Modified`` validators, keyed by URL and query parameters. The next
+request for the same resource sends ``If-None-Match`` / ``If-Modified-Since``;
+when GitHub answers ``304 Not Modified`` the cached body is served instead,
+and the request does not count against the primary rate limit.
+
+The cache lives at GITHUB_CACHE_PATH (default .cache/github_http_cache.json).
+Entries not requested during a run are dropped when it is saved, so removed
+repositories do not linger.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from urllib.parse import urlencode
+
+import requests
+
+DEFAULT_GITHUB_CACHE_PATH = '.cache/github_http_cache.json'
+
+# Response headers replayed on a cache hit (Link carries the page counts)
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+
+class GitHubHTTPCache:
+    """
+    Drop-in for ``session.get`` that revalidates stored responses instead of
+    downloading them again. Safe to share between worker threads.
+    """
+
+    def __init__(self, session, path):
+        self.session = session
+        self.path = Path(path)
+        self.entries = {}
+        self.used = set()
+        self.requests = 0
+        self.revalidated = 0
+        self.not_modified = 0
+        self.rate_limit_remaining = None
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable GitHub cache {self.path}: {e}")
+
+    @staticmethod
+    def key(url, params=None):
+        """Cache key of a request: its URL with the query parameters in sorted order"""
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def get(self, url, params=None, **kwargs):
+        """GET ``url``, answering from the cache when GitHub reports it unchanged"""
+        key = self.key(url, params)
+        with self._lock:
+            entry = self.entries.get(key)
+            self.used.add(key)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.session.get(url, params=params, headers=headers, **kwargs)
+
+        with self._lock:
+            self.requests += 1
+            if entry:
+                self.revalidated += 1
+            remaining = response.headers.get('X-RateLimit-Remaining')
+            if remaining is not None:
+                remaining = int(remaining)
+                if self.rate_limit_remaining is None or remaining < self.rate_limit_remaining:
+                    self.rate_limit_remaining = remaining
+
+            if response.status_code == 304 and entry:
+                self.not_modified += 1
+                return self._cached_response(response, entry)
+
+            if response.status_code == 200 and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+                self.entries[key] = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'headers': {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+                    'body': response.text,
+                }
+        return response
+
+    @staticmethod
+    def _cached_response(not_modified, entry):
+        """A 200 response rebuilt from a cache entry, for a request answered 304"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.encoding = 'utf-8'
+        response.headers.update(entry['headers'])
+        response._content = entry['body'].encode('utf-8')
+        return response
+
+    def save(self):
+        """Write the entries requested this run to disk atomically"""
+        with self._lock:
+            self.entries = {key: entry for key, entry in self.entries.items() if key in self.used}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+    def summary(self):
+        ratio = self.not_modified / self.requests if self.requests else 0
+        text = (f"{self.not_modified}/{self.requests} requests not modified ({ratio:.0%}), "
+                f"{self.revalidated} revalidated, {self.requests - self.not_modified} counted against the rate limit")
+        if self.rate_limit_remaining is not None:
+            text += f", {self.rate_limit_remaining} remaining"
+        return text
+
+
+def open_github_cache(session):
+    """Open the cache configured by GITHUB_CACHE_PATH around ``session``"""
+    return GitHubHTTPCache(session, os.getenv('GITHUB_CACHE_PATH', DEFAULT_GITHUB_CACHE_PATH))
@@ -43,12 +43,12 @@ class HTMLReportGenerator:
         if not messages or not isinstance(messages, list):
             return "No messages available"
         
-        dropdown_html = f"""
+        parts = [f"""
         <div class="messages-dropdown">
             <button class="dropdown-btn" onclick="toggleDropdown({chat_id})">
                 View Messages <span class="messages-count">({len(messages)} messages)</span>
             </button>
-            <div id="dropdown-{chat_id}" class="dropdown-content">"""
+            <div id="dropdown-{chat_id}" class="dropdown-content">"""]
         
         for msg in messages:
             if isinstance(msg, dict):
@@ -66,26 +66,27 @@ class HTMLReportGenerator:
                 except:
                     formatted_time = timestamp
                 
-                dropdown_html += f"""
+                parts.append(f"""
                 <div class="message-item">
                     <div class="message-header">
                         <span class="message-sender">{sender}</span>
                         <span class="message-timestamp">{formatted_time}</span>
                     </div>
                     <div class="message-content">{content}</div>
-                </div>"""
+                </div>""")
         
-        dropdown_html += """
+        parts.append("""
             </div>
-        </div>"""
+        </div>""")
         
-        return dropdown_html
+        # Joined once at the end; appending to one string copies it per message
+        return ''.join(parts)
     
     def generate_verification_report(self, verification_results: Dict[int, Dict[str, any]]) -> str:
         """Generate HTML report for chat verification results."""
         
         # Generate table rows
-        table_rows = ""
+        rows = []
         for chat_id, result in verification_results.items():
             status = "Yes" if result['accessible'] else "No"
             status_class = "success" if result['accessible'] else "error"
@@ -95,7 +96,7 @@ class HTMLReportGenerator:
             # Generate messages dropdown
             messages_dropdown = self._generate_messages_dropdown(chat_id, recent_messages)
             
-            table_rows += f"""
+            rows.append(f"""
                 <tr>
                     <td>{chat_id}</td>
                     <td class="chat-name">{chat_name}</td>
@@ -103,7 +104,8 @@ class HTMLReportGenerator:
                     <td>{html.escape(result['message'])}</td>
                     <td>{messages_dropdown}</td>
                     <td>{result['verified_at']}</td>
-                </tr>"""
+                </tr>""")
+        table_rows = ''.join(rows)
         
         # Generate content for template
         content = f"""
@@ -0,0 +1,171 @@
+"""
+Append-only index of generated report pages.
+
+Whenever a report page is built or its figures change, one JSON line
+describing it is appended to the index: chat, UTC day, counts, file name
+and the input fingerprint it was built from (``input_fingerprint``, which
+pages indexed from their HTML don't have). Lines are never edited in place, so an interrupted run
+can at worst leave a truncated last line, which is ignored. metadata.json is
+compacted from the index without opening any report HTML.
+
+Later lines for the same report supersede earlier ones. Reports older than
+the retention window are expired, and ``compact()`` rewrites the file with
+only the live lines once superseded or expired ones dominate.
+
+Report pages from before the index existed are added by
+``index_legacy_reports()``, which reads their figures back from the HTML.
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Fields of an index record that describe the chat rather than the report
+CHAT_FIELDS = ('chat', 'name')
+
+
+class ReportIndex:
+    """Latest record per report file name, backed by an append-only JSON lines file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.records = {}
+        self.lines = 0
+        self._lock = threading.Lock()
+        # Set when an interrupted write left the last line unterminated
+        self._partial_line = False
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._partial_line = not line.endswith('\n')
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        print(f"Warning: skipping unreadable line in {self.path}")
+                        continue
+                    self.records[record['filename']] = record
+                    self.lines += 1
+
+    def append(self, records):
+        """Append the records that are new or differ from the indexed ones; returns how many"""
+        with self._lock:
+            changed = [record for record in records if self.records.get(record['filename']) != record]
+            if changed:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    if self._partial_line:
+                        f.write('\n')
+                        self._partial_line = False
+                    for record in changed:
+                        f.write(json.dumps(record, sort_keys=True, default=str) + '\n')
+                for record in changed:
+                    self.records[record['filename']] = record
+                self.lines += len(changed)
+            return len(changed)
+
+    def expire(self, since):
+        """Forget reports for days before ``since`` (a YYYY-MM-DD date); returns how many"""
+        with self._lock:
+            expired = [filename for filename, record in self.records.items() if record['date'] < since]
+            for filename in expired:
+                del self.records[filename]
+            return len(expired)
+
+    def metadata(self):
+        """
+        metadata.json contents: ``{chat: {'name', 'reports'}}`` with reports
+        newest first. Records whose page no longer exists are left out.
+        """
+        chats = {}
+        ordered = sorted(self.records.values(), key=lambda record: (record['date'], record['filename']), reverse=True)
+        for record in ordered:
+            if not (self.path.parent / record['filename']).exists():
+                continue
+            chat = chats.setdefault(record['chat'], {'name': record['name'], 'reports': []})
+            chat['reports'].append({key: value for key, value in record.items() if key not in CHAT_FIELDS})
+        return chats
+
+    def compact(self, min_ratio=2):
+        """Rewrite the file with only the latest records once it holds min_ratio times as many lines"""
+        with self._lock:
+            if self.lines <= min_ratio * len(self.records):
+                return False
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for filename in sorted(self.records):
+                    f.write(json.dumps(self.records[filename], sort_keys=True, default=str) + '\n')
+            os.replace(tmp_path, self.path)
+            self.lines = len(self.records)
+            self._partial_line = False
+            return True
+
+
+def extract_stats_from_report(content):
+    """Extract total_messages and unique_participants from a report's HTML"""
+    # Extract total messages from the section note
+    total_messages_match = re.search(r'Total messages: (\d+)', content)
+    total_messages = int(total_messages_match.group(1)) if total_messages_match else 0
+
+    # Extract unique participants from the stat card
+    participants_match = re.search(r'<div class="stat-value">(\d+)</div>\s*<div class="stat-label">Active Participants</div>', content)
+    unique_participants = int(participants_match.group(1)) if participants_match else 0
+
+    return total_messages, unique_participants
+
+
+def record_from_report(report_file):
+    """Build an index record from a report HTML file, or None if it can't be read"""
+    # Format: report_1002009589709_20250717.html
+    match = re.match(r'report_(\d+)_(\d{8})\.html', report_file.name)
+    if not match:
+        return None
+    chat_id, date_str = match.groups()
+
+    try:
+        with open(report_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        print(f"Error reading {report_file}: {e}")
+        return None
+
+    total_messages, unique_participants = extract_stats_from_report(content)
+    title_match = re.search(r'<title>.*? - (.*?) Report', content)
+
+    start_date = datetime.strptime(date_str, '%Y%m%d').replace(tzinfo=timezone.utc)
+    end_date = start_date + timedelta(days=1)
+    return {
+        'chat': chat_id,
+        'name': title_match.group(1) if title_match else '',
+        'date': start_date.strftime('%Y-%m-%d'),
+        'filename': report_file.name,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'total_messages': total_messages,
+        'unique_participants': unique_participants,
+        # Older pages may cover a rolling window rather than the UTC day in
+        # their name, so they are never final; the next build replaces them
+        'closed': False
+    }
+
+
+def index_legacy_reports(index, since=None):
+    """
+    Add report pages in the index's directory that it doesn't know about,
+    optionally only those for days from ``since`` (YYYY-MM-DD) on; returns
+    how many were added. Only unindexed pages are opened.
+    """
+    unindexed = []
+    for report_file in sorted(index.path.parent.glob('report_*.html')):
+        match = re.match(r'report_\d+_(\d{4})(\d{2})(\d{2})\.html', report_file.name)
+        if not match or report_file.name in index.records:
+            continue
+        if since and '-'.join(match.groups()) < since:
+            continue
+        unindexed.append(report_file)
+    return index.append([record for record in map(record_from_report, unindexed) if record])
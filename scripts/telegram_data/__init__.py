@@ -0,0 +1,29 @@
+"""
+Data access for the Wartime Milady CEO pipeline scripts.
+
+Scripts get their data through ``get_backend()``, which lazily opens the
+backend configured by the environment (Supabase, or the local SQLite mirror
+when TELEGRAM_MIRROR_PATH is set) and shares it across the process.
+``set_backend()`` swaps in another backend such as ``MemoryBackend``.
+"""
+
+from .client import ConfigurationError, get_client
+from .backends import SupabaseBackend, MemoryBackend, open_backend, get_backend, set_backend
+from .mirror import TelegramMirror, utc_timestamp
+from .users import UserDirectory
+from .queries import ceil_hour, summarize_hourly_stats
+
+__all__ = [
+    'ConfigurationError',
+    'get_client',
+    'SupabaseBackend',
+    'MemoryBackend',
+    'TelegramMirror',
+    'UserDirectory',
+    'open_backend',
+    'get_backend',
+    'set_backend',
+    'utc_timestamp',
+    'ceil_hour',
+    'summarize_hourly_stats',
+]
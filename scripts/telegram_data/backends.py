@@ -0,0 +1,133 @@
+"""
+Interchangeable data backends for the generator scripts.
+
+Every backend exposes the same query methods:
+
+- ``iter_messages(columns, chat_id=None, chat_ids=None, start=None, end=None, filters=None, descending=False)``
+- ``get_chat_messages(chat_id, start, end, limit=100)``
+- ``get_chat_window_stats(chat_id, start, end)``
+- ``get_chat_hourly_stats(chat_id, start, end)``
+- ``get_chats_activity_24h(chat_ids, cutoff)``
+- ``get_chats_active_since(since)``
+- ``get_chats(chat_ids)``, ``get_users(user_ids)``, ``get_forum_topics(chat_ids)``
+
+``SupabaseBackend`` queries Supabase, ``TelegramMirror`` a synced local
+SQLite copy, and ``MemoryBackend`` rows handed to it directly (for tests and
+benchmarks without credentials). ``get_backend`` picks one from the
+environment on first use; ``set_backend`` swaps in another.
+"""
+
+import os
+import threading
+
+from . import queries
+from .client import get_client
+from .mirror import TelegramMirror, DEFAULT_HISTORY_DAYS
+from .users import open_user_directory
+
+MESSAGE_LIST_COLUMNS = 'id, telegram_message_id, from_user_id, date, text, message_type, reply_to_message_id'
+
+_backend = None
+_lock = threading.Lock()
+
+
+class SupabaseBackend:
+    """Backend that queries Supabase directly"""
+
+    # One client is shared by all threads; its HTTP pool lets concurrent
+    # queries overlap their network waits
+    parallel_reads = True
+
+    def __init__(self, client, user_directory=None):
+        self.client = client
+        self.user_directory = user_directory
+
+    def close(self):
+        if self.user_directory:
+            self.user_directory.save()
+
+    def iter_messages(self, columns, **kwargs):
+        return queries.iter_messages(self.client, columns, **kwargs)
+
+    def get_chat_messages(self, chat_id, start, end, limit=100):
+        """Newest-first messages from a chat within ``[start, end)``; ``limit=None`` returns all"""
+        if limit is None:
+            return list(queries.iter_messages(
+                self.client, MESSAGE_LIST_COLUMNS, chat_id=chat_id, start=start, end=end, descending=True
+            ))
+
+        response = self.client.table('messages_v1').select(MESSAGE_LIST_COLUMNS).eq(
+            'chat_id', chat_id
+        ).gte('date', start.isoformat()).lt('date', end.isoformat()).order('date', desc=True).limit(limit).execute()
+        return response.data
+
+    def get_chat_window_stats(self, chat_id, start, end):
+        return queries.get_chat_window_stats(self.client, chat_id, start, end)
+
+    def get_chat_hourly_stats(self, chat_id, start, end):
+        return queries.get_chat_hourly_stats(self.client, chat_id, start, end)
+
+    def get_chats_activity_24h(self, chat_ids, cutoff):
+        return queries.get_chats_activity_24h(self.client, chat_ids, cutoff)
+
+    def get_chats_active_since(self, since):
+        return queries.get_chats_active_since(self.client, since)
+
+    def get_chats(self, chat_ids):
+        return self.client.table('chats_v1').select('*').in_('chat_id', list(chat_ids)).execute().data
+
+    def get_users(self, user_ids):
+        if self.user_directory:
+            return list(self.user_directory.lookup(self.client, user_ids).values())
+        return self.client.table('users_v1').select('*').in_('user_id', list(user_ids)).execute().data
+
+    def get_forum_topics(self, chat_ids):
+        return self.client.table('forum_topics_v1').select('*').in_('chat_id', list(chat_ids)).execute().data
+
+
+class MemoryBackend(TelegramMirror):
+    """
+    Backend over rows supplied in memory, e.g.
+    ``MemoryBackend({'chats_v1': [...], 'messages_v1': [...]})``.
+    """
+
+    def __init__(self, tables=None):
+        super().__init__(':memory:')
+        if tables:
+            self.load(tables)
+
+    def sync(self, client):
+        return {}
+
+
+def open_backend():
+    """
+    Open the backend configured by the environment: the local mirror when
+    TELEGRAM_MIRROR_PATH is set (synced before it is returned), otherwise
+    Supabase with the persistent user directory.
+    """
+    client = get_client()
+    path = os.getenv('TELEGRAM_MIRROR_PATH')
+    if path:
+        history_days = int(os.getenv('TELEGRAM_MIRROR_HISTORY_DAYS', DEFAULT_HISTORY_DAYS))
+        mirror = TelegramMirror(path, history_days=history_days)
+        mirror.sync(client)
+        return mirror
+
+    return SupabaseBackend(client, open_user_directory(client))
+
+
+def get_backend():
+    """Get the process-wide backend, opening it on first use"""
+    global _backend
+    with _lock:
+        if _backend is None:
+            _backend = open_backend()
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the process-wide backend (None reopens from the environment on next use)"""
+    global _backend
+    with _lock:
+        _backend = backend
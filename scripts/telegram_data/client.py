@@ -0,0 +1,36 @@
+"""
+Lazily created, process-wide Supabase client.
+
+Nothing here touches the network or the environment at import time, so
+scripts can be imported without credentials. The client is created on first
+use and then shared, so every stage and worker thread in a process reuses
+the same HTTP connection pool.
+"""
+
+import os
+import threading
+
+_client = None
+_lock = threading.Lock()
+
+
+class ConfigurationError(RuntimeError):
+    """Raised when the environment is missing settings a backend needs"""
+
+
+def get_client():
+    """Get the shared Supabase client, creating it on first use"""
+    global _client
+    with _lock:
+        if _client is None:
+            supabase_url = os.getenv('SUPABASE_URL')
+            supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+            if not supabase_url or not supabase_key:
+                raise ConfigurationError(
+                    "SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY environment variables are required"
+                )
+
+            # Imported here so the mirror and in-memory backends work without supabase installed
+            from supabase import create_client
+            _client = create_client(supabase_url, supabase_key)
+    return _client
@@ -0,0 +1,490 @@
+"""
+Local SQLite mirror of the Telegram tables.
+
+Each pipeline run syncs only what changed since the previous run:
+new messages by ``id``, edited or deleted messages by ``updated_at``, users
+and chats by ``updated_at``. Report and summary queries then run locally.
+
+Set TELEGRAM_MIRROR_PATH to make the mirror the generator scripts' backend.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .queries import iter_keyset_pages, ceil_hour, DEFAULT_PAGE_SIZE
+
+DEFAULT_HISTORY_DAYS = 8
+
+# How far back each sync re-reads past the previous one, to catch rows whose
+# transactions committed after the watermarks had moved on
+SYNC_OVERLAP = timedelta(minutes=15)
+MESSAGE_ID_OVERLAP = 1000
+
+MESSAGE_COLUMNS = [
+    'id', 'telegram_message_id', 'chat_id', 'from_user_id', 'message_thread_id', 'date',
+    'edit_date', 'text', 'message_type', 'reply_to_message_id', 'reply_to_chat_id',
+    'is_deleted', 'created_at', 'updated_at'
+]
+USER_COLUMNS = [
+    'user_id', 'username', 'first_name', 'last_name', 'is_bot', 'is_premium',
+    'language_code', 'created_at', 'updated_at'
+]
+CHAT_COLUMNS = [
+    'chat_id', 'chat_type', 'title', 'username', 'description', 'is_forum',
+    'member_count', 'created_at', 'updated_at', 'last_message_at'
+]
+TOPIC_COLUMNS = ['topic_id', 'chat_id', 'name', 'is_closed', 'created_at']
+
+# Supabase table -> (mirror table, columns)
+TABLES = {
+    'messages_v1': ('messages', MESSAGE_COLUMNS),
+    'users_v1': ('users', USER_COLUMNS),
+    'chats_v1': ('chats', CHAT_COLUMNS),
+    'forum_topics_v1': ('forum_topics', TOPIC_COLUMNS),
+}
+
+BOOLEAN_COLUMNS = {'is_deleted', 'is_bot', 'is_premium', 'is_forum', 'is_closed'}
+TIMESTAMP_COLUMNS = {'date', 'edit_date', 'created_at', 'updated_at', 'last_message_at'}
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    telegram_message_id INTEGER,
+    chat_id INTEGER NOT NULL,
+    from_user_id INTEGER,
+    message_thread_id INTEGER,
+    date TEXT NOT NULL,
+    edit_date TEXT,
+    text TEXT,
+    message_type TEXT,
+    reply_to_message_id INTEGER,
+    reply_to_chat_id INTEGER,
+    is_deleted INTEGER,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_messages_chat_date ON messages(chat_id, date);
+CREATE INDEX IF NOT EXISTS idx_messages_date ON messages(date);
+CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages(chat_id, message_thread_id, date);
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    is_bot INTEGER,
+    is_premium INTEGER,
+    language_code TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS chats (
+    chat_id INTEGER PRIMARY KEY,
+    chat_type TEXT,
+    title TEXT,
+    username TEXT,
+    description TEXT,
+    is_forum INTEGER,
+    member_count INTEGER,
+    created_at TEXT,
+    updated_at TEXT,
+    last_message_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS forum_topics (
+    topic_id INTEGER NOT NULL,
+    chat_id INTEGER NOT NULL,
+    name TEXT,
+    is_closed INTEGER,
+    created_at TEXT,
+    PRIMARY KEY (chat_id, topic_id)
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+'''
+
+
+def utc_timestamp(value):
+    """
+    Normalise a datetime or ISO string to a fixed-width UTC ISO string.
+
+    Naive datetimes are taken as UTC, as the Supabase session does. The fixed
+    width makes stored timestamps compare correctly as plain strings.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+
+def sync_started_at():
+    """Watermark to store for a sync starting now (see ``iter_changed_pages``)"""
+    return utc_timestamp(datetime.now(timezone.utc))
+
+
+def iter_changed_pages(client, table, key, watermark, apply_filters=None):
+    """
+    Yield pages of ``table`` rows updated since ``watermark``, walked in
+    ``(updated_at, key)`` order; with no watermark, the whole table.
+
+    ``updated_at`` is stamped when a transaction starts but only becomes
+    visible when it commits, so a row can appear behind a watermark that has
+    already moved past it. Callers therefore store the time their sync
+    started (``sync_started_at()``) rather than the newest value seen, and
+    every pass re-reads SYNC_OVERLAP before the watermark. Rows read twice
+    are harmless as long as they are upserted.
+    """
+    since = utc_timestamp(datetime.fromisoformat(watermark) - SYNC_OVERLAP) if watermark else None
+
+    def changed_rows(query):
+        if apply_filters is not None:
+            query = apply_filters(query)
+        return query.gt('updated_at', since) if since else query
+
+    return iter_keyset_pages(client, table, '*', ['updated_at', key], changed_rows)
+
+
+class TelegramMirror:
+    """Incrementally synced local copy of messages_v1, users_v1, chats_v1 and forum_topics_v1."""
+
+    # Queries are served one at a time from a single local connection, so
+    # concurrent callers gain nothing from overlapping them
+    parallel_reads = False
+
+    def __init__(self, path, history_days=DEFAULT_HISTORY_DAYS):
+        self.path = Path(path)
+        if str(path) != ':memory:':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.history_days = history_days
+        # Shared across threads; every use of the connection holds the lock
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.lock = threading.RLock()
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # Sync
+
+    def _get_state(self, name, default=None):
+        row = self.conn.execute('SELECT value FROM sync_state WHERE name = ?', (name,)).fetchone()
+        return row['value'] if row else default
+
+    def _set_state(self, name, value):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)', (name, str(value))
+        )
+
+    def _upsert(self, table, columns, rows):
+        """Insert or replace rows, normalising timestamps and booleans"""
+        placeholders = ', '.join('?' for _ in columns)
+        values = []
+        for row in rows:
+            record = []
+            for column in columns:
+                value = row.get(column)
+                if column in TIMESTAMP_COLUMNS:
+                    value = utc_timestamp(value)
+                elif column in BOOLEAN_COLUMNS and value is not None:
+                    value = int(bool(value))
+                record.append(value)
+            values.append(record)
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", values
+        )
+
+    def _upsert_changed(self, table, columns, key, rows):
+        """Upsert the rows not held or whose updated_at differs; returns (inserted, updated)"""
+        keys = [row[key] for row in rows]
+        held = dict(self.conn.execute(
+            f"SELECT {key}, updated_at FROM {table} WHERE {key} IN ({', '.join('?' for _ in keys)})", keys
+        ).fetchall())
+        fresh = [row for row in rows if row[key] not in held or held[row[key]] != utc_timestamp(row['updated_at'])]
+        self._upsert(table, columns, fresh)
+        inserted = sum(1 for row in fresh if row[key] not in held)
+        return inserted, len(fresh) - inserted
+
+    def _sync_by_updated_at(self, client, source, table, columns, key):
+        """Pull rows of a small table changed since the last sync"""
+        synced_at = sync_started_at()
+        count = 0
+        for page in iter_changed_pages(client, source, key, self._get_state(f'{table}.updated_at')):
+            count += sum(self._upsert_changed(table, columns, key, page))
+
+        self._set_state(f'{table}.updated_at', synced_at)
+        return count
+
+    def _sync_messages(self, client):
+        """
+        Pull new messages by id and changed ones by updated_at.
+
+        Neither watermark is exact: ids and updated_at values are assigned
+        when a transaction starts but become visible when it commits. Edits
+        are read with the overlap of ``iter_changed_pages``, and the id scan
+        re-reads the last MESSAGE_ID_OVERLAP ids; only rows that actually
+        differ are written.
+        """
+        synced_at = sync_started_at()
+        last_id = int(self._get_state('messages.last_id', 0))
+        watermark = self._get_state('messages.updated_at')
+        changed = 0
+        new = 0
+
+        # Edits and deletions of rows we already hold, plus rows that
+        # committed after later ids had been synced
+        if last_id and watermark:
+            def held_rows(query):
+                return query.lte('id', last_id)
+
+            for page in iter_changed_pages(client, 'messages_v1', 'id', watermark, held_rows):
+                inserted, updated = self._upsert_changed('messages', MESSAGE_COLUMNS, 'id', page)
+                new += inserted
+                changed += updated
+
+        # First sync: backfill only the history window, found via created_at
+        if not last_id:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=self.history_days)
+            first = client.table('messages_v1').select('id').gte(
+                'created_at', cutoff.isoformat()
+            ).order('id').limit(1).execute().data
+            if not first:
+                return 0, 0
+            start_id = first[0]['id'] - 1
+        else:
+            start_id = max(0, last_id - MESSAGE_ID_OVERLAP)
+
+        def new_rows(query):
+            return query.gt('id', start_id)
+
+        for page in iter_keyset_pages(client, 'messages_v1', '*', ['id'], new_rows):
+            inserted, updated = self._upsert_changed('messages', MESSAGE_COLUMNS, 'id', page)
+            new += inserted
+            changed += updated
+            last_id = max(last_id, page[-1]['id'])
+
+        self._set_state('messages.last_id', last_id)
+        self._set_state('messages.updated_at', synced_at)
+        return new, changed
+
+    def _sync_forum_topics(self, client):
+        """Refresh forum topics in full; the table is tiny and has no updated_at"""
+        topics = []
+        for page in iter_keyset_pages(client, 'forum_topics_v1', '*', ['chat_id', 'topic_id']):
+            topics.extend(page)
+        self.conn.execute('DELETE FROM forum_topics')
+        self._upsert('forum_topics', TOPIC_COLUMNS, topics)
+        return len(topics)
+
+    def prune(self):
+        """Drop messages older than the history window"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.history_days)
+        self.conn.execute('DELETE FROM messages WHERE date < ?', (utc_timestamp(cutoff),))
+
+    def sync(self, client):
+        """Bring the mirror up to date with Supabase and return row counts"""
+        with self.lock, self.conn:
+            users = self._sync_by_updated_at(client, 'users_v1', 'users', USER_COLUMNS, 'user_id')
+            chats = self._sync_by_updated_at(client, 'chats_v1', 'chats', CHAT_COLUMNS, 'chat_id')
+            topics = self._sync_forum_topics(client)
+            new, changed = self._sync_messages(client)
+            self.prune()
+
+        print(f"🔄 Mirror synced: {new} new messages, {changed} changed, {users} users, {chats} chats, {topics} topics")
+        return {'messages': new, 'changed_messages': changed, 'users': users, 'chats': chats, 'forum_topics': topics}
+
+    def load(self, tables):
+        """
+        Insert rows given as ``{table: rows}`` using the Supabase table names
+        (``messages_v1``, ``users_v1``, ``chats_v1``, ``forum_topics_v1``).
+        """
+        with self.lock, self.conn:
+            for source, rows in tables.items():
+                table, columns = TABLES[source]
+                self._upsert(table, columns, rows)
+
+    # Queries
+
+    def _query(self, sql, params=()):
+        """Run a read query and return all of its rows"""
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _row(self, row):
+        record = dict(row)
+        for column in BOOLEAN_COLUMNS.intersection(record):
+            if record[column] is not None:
+                record[column] = bool(record[column])
+        return record
+
+    def _columns(self, columns, required=()):
+        selected = [c.strip() for c in columns.split(',') if c.strip()]
+        if selected == ['*']:
+            return list(MESSAGE_COLUMNS)
+        unknown = [c for c in selected if c not in MESSAGE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown messages_v1 columns: {', '.join(unknown)}")
+        return selected + [c for c in required if c not in selected]
+
+    def iter_messages(self, columns, chat_id=None, chat_ids=None, start=None, end=None,
+                      filters=None, descending=False, page_size=DEFAULT_PAGE_SIZE):
+        """Local equivalent of ``queries.iter_messages``"""
+        keys = ['chat_id', 'date', 'id'] if chat_id is None and chat_ids is not None else ['date', 'id']
+        select = self._columns(columns, keys)
+
+        where = []
+        params = []
+        if chat_id is not None:
+            where.append('chat_id = ?')
+            params.append(chat_id)
+        elif chat_ids is not None:
+            chat_ids = list(chat_ids)
+            where.append(f"chat_id IN ({', '.join('?' for _ in chat_ids)})")
+            params.extend(chat_ids)
+        if start is not None:
+            where.append('date >= ?')
+            params.append(utc_timestamp(start))
+        if end is not None:
+            where.append('date < ?')
+            params.append(utc_timestamp(end))
+        for column, value in (filters or {}).items():
+            self._columns(column)
+            where.append(f'{column} = ?')
+            params.append(value)
+
+        direction = 'DESC' if descending else 'ASC'
+        sql = f"SELECT {', '.join(select)} FROM messages"
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY ' + ', '.join(f'{key} {direction}' for key in keys)
+
+        for row in self._query(sql, params):
+            yield self._row(row)
+
+    def get_chat_messages(self, chat_id, start, end, limit=100):
+        """Newest-first messages from a chat within ``[start, end)``; ``limit=None`` returns all"""
+        rows = self._query(
+            '''SELECT id, telegram_message_id, from_user_id, date, text, message_type, reply_to_message_id
+               FROM messages WHERE chat_id = ? AND date >= ? AND date < ?
+               ORDER BY date DESC LIMIT ?''',
+            (chat_id, utc_timestamp(start), utc_timestamp(end), -1 if limit is None else limit)
+        )
+        return [self._row(row) for row in rows]
+
+    def get_chat_window_stats(self, chat_id, start, end):
+        """Local equivalent of ``queries.get_chat_window_stats``"""
+        params = (chat_id, utc_timestamp(start), utc_timestamp(end))
+        window = 'FROM messages WHERE chat_id = ? AND date >= ? AND date < ?'
+
+        totals = self._query(
+            f'SELECT COUNT(*), COUNT(DISTINCT from_user_id), MAX(date) {window}', params
+        )[0]
+        message_types = dict(self._query(
+            f"SELECT COALESCE(message_type, 'text'), COUNT(*) {window} GROUP BY 1", params
+        ))
+        hourly_activity = dict(self._query(
+            f'SELECT substr(date, 12, 2), COUNT(*) {window} GROUP BY 1', params
+        ))
+
+        return {
+            'total_messages': totals[0],
+            'unique_participants': totals[1],
+            'message_types': message_types,
+            'hourly_activity': hourly_activity,
+            'last_message': totals[2]
+        }
+
+    def get_chat_hourly_stats(self, chat_id, start, end):
+        """Local equivalent of ``queries.get_chat_hourly_stats``"""
+        rows = self._query(
+            '''SELECT substr(date, 1, 13) AS hour, from_user_id, COALESCE(message_type, 'text') AS message_type, date,
+                      updated_at
+               FROM messages WHERE chat_id = ? AND date >= ? AND date < ?
+               ORDER BY date''',
+            (chat_id, utc_timestamp(ceil_hour(start)), utc_timestamp(ceil_hour(end)))
+        )
+
+        buckets = {}
+        for row in rows:
+            hour = row['hour'] + ':00:00+00:00'
+            bucket = buckets.setdefault(hour, {
+                'hour': hour, 'message_count': 0, 'message_types': {},
+                'participants': [], 'last_message_at': None, 'last_updated_at': None
+            })
+            bucket['message_count'] += 1
+            bucket['message_types'][row['message_type']] = bucket['message_types'].get(row['message_type'], 0) + 1
+            if row['from_user_id'] is not None and row['from_user_id'] not in bucket['participants']:
+                bucket['participants'].append(row['from_user_id'])
+            bucket['last_message_at'] = row['date']
+            if row['updated_at'] and (bucket['last_updated_at'] is None or row['updated_at'] > bucket['last_updated_at']):
+                bucket['last_updated_at'] = row['updated_at']
+
+        return list(buckets.values())
+
+    def get_chats_activity_24h(self, chat_ids, cutoff):
+        """Local equivalent of ``queries.get_chats_activity_24h``"""
+        chat_ids = list(chat_ids)
+        if not chat_ids:
+            return {}
+
+        cutoff_ts = utc_timestamp(cutoff)
+        prev_ts = utc_timestamp(datetime.fromisoformat(cutoff_ts) - timedelta(hours=24))
+        rows = self._query(
+            f'''SELECT chat_id,
+                       SUM(date >= :cutoff) AS messages_24h,
+                       COUNT(DISTINCT CASE WHEN date >= :cutoff THEN from_user_id END) AS participants_24h,
+                       SUM(date < :cutoff) AS prev_messages_24h,
+                       COUNT(DISTINCT CASE WHEN date < :cutoff THEN from_user_id END) AS prev_participants_24h
+                FROM messages
+                WHERE chat_id IN ({', '.join(f':c{i}' for i in range(len(chat_ids)))})
+                  AND date >= :prev
+                GROUP BY chat_id''',
+            {'cutoff': cutoff_ts, 'prev': prev_ts, **{f'c{i}': c for i, c in enumerate(chat_ids)}}
+        )
+        return {row['chat_id']: dict(row) for row in rows}
+
+    def get_chats_active_since(self, since):
+        """Local equivalent of ``queries.get_chats_active_since``"""
+        columns = ', '.join(f'c.{column}' for column in CHAT_COLUMNS if column != 'last_message_at')
+        rows = self._query(
+            f'''SELECT {columns}, MAX(m.date) AS last_message_at
+                FROM chats c JOIN messages m ON m.chat_id = c.chat_id
+                WHERE m.date >= ?
+                GROUP BY c.chat_id
+                ORDER BY last_message_at DESC''',
+            (utc_timestamp(since),)
+        )
+        return [self._row(row) for row in rows]
+
+    def get_chats(self, chat_ids):
+        """``chats_v1`` rows for the given chat IDs"""
+        chat_ids = list(chat_ids)
+        rows = self._query(
+            f"SELECT * FROM chats WHERE chat_id IN ({', '.join('?' for _ in chat_ids)})", chat_ids
+        )
+        return [self._row(row) for row in rows]
+
+    def get_users(self, user_ids):
+        """``users_v1`` rows for the given user IDs"""
+        user_ids = list(user_ids)
+        rows = self._query(
+            f"SELECT * FROM users WHERE user_id IN ({', '.join('?' for _ in user_ids)})", user_ids
+        )
+        return [self._row(row) for row in rows]
+
+    def get_forum_topics(self, chat_ids):
+        """``forum_topics_v1`` rows for the given chat IDs"""
+        chat_ids = list(chat_ids)
+        rows = self._query(
+            f"SELECT * FROM forum_topics WHERE chat_id IN ({', '.join('?' for _ in chat_ids)})", chat_ids
+        )
+        return [self._row(row) for row in rows]
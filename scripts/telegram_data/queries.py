@@ -0,0 +1,225 @@
+"""
+Shared Supabase query helpers for the Wartime Milady CEO pipeline scripts.
+
+PostgREST silently truncates every response to the server's ``max_rows``
+(1000 on our project, see bot/supabase/config.toml), so any read of
+``messages_v1`` that can match more rows than that must be paginated.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+def _quote(value):
+    """Quote a value for use inside a PostgREST ``or`` filter"""
+    return '"' + str(value).replace('"', '\\"') + '"'
+
+
+def _keyset_filter(keys, cursor, descending=False):
+    """Build the ``or`` filter selecting rows strictly after ``cursor``"""
+    op = 'lt' if descending else 'gt'
+    clauses = []
+    for i, key in enumerate(keys):
+        terms = [f"{k}.eq.{_quote(cursor[k])}" for k in keys[:i]]
+        terms.append(f"{key}.{op}.{_quote(cursor[key])}")
+        clauses.append(terms[0] if len(terms) == 1 else f"and({','.join(terms)})")
+    return ','.join(clauses)
+
+
+def iter_keyset_pages(client, table, columns, keys, apply_filters=None,
+                      descending=False, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Yield pages of ``table`` rows walked in ``keys`` order with keyset cursors.
+
+    ``keys`` must be unique together so no row is skipped or repeated, and
+    are added to the selected columns if missing. ``apply_filters`` is an
+    optional callable that takes and returns a query builder.
+    """
+    selected = [c.strip() for c in columns.split(',') if c.strip()]
+    select = ', '.join(selected + [k for k in keys if k not in selected and '*' not in selected])
+
+    cursor = None
+    while True:
+        query = client.table(table).select(select)
+        if apply_filters is not None:
+            query = apply_filters(query)
+        if cursor is not None:
+            query = query.or_(_keyset_filter(keys, cursor, descending))
+        for key in keys:
+            query = query.order(key, desc=descending)
+
+        rows = query.limit(page_size).execute().data
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        cursor = rows[-1]
+
+
+def iter_message_pages(client, columns, chat_id=None, chat_ids=None, start=None, end=None,
+                       filters=None, descending=False, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Yield pages of ``messages_v1`` rows using keyset pagination.
+
+    Rows are walked in ``(chat_id, date, id)`` order when ``chat_ids`` is
+    given and in ``(date, id)`` order otherwise, so each page is one indexed
+    range query and no page is ever skipped or repeated, however many rows
+    the window holds.
+    ``start`` is inclusive and ``end`` exclusive, matching the existing
+    ``gte``/``lt`` window queries. ``filters`` is an optional dict of extra
+    equality filters, e.g. ``{'message_thread_id': 12}``.
+    """
+    keys = ['chat_id', 'date', 'id'] if chat_id is None and chat_ids is not None else ['date', 'id']
+
+    def apply_filters(query):
+        if chat_id is not None:
+            query = query.eq('chat_id', chat_id)
+        elif chat_ids is not None:
+            query = query.in_('chat_id', list(chat_ids))
+        if start is not None:
+            query = query.gte('date', start.isoformat())
+        if end is not None:
+            query = query.lt('date', end.isoformat())
+        for column, value in (filters or {}).items():
+            query = query.eq(column, value)
+        return query
+
+    return iter_keyset_pages(client, 'messages_v1', columns, keys, apply_filters,
+                             descending=descending, page_size=page_size)
+
+
+def iter_messages(client, columns, **kwargs):
+    """Yield ``messages_v1`` rows one at a time; see ``iter_message_pages``"""
+    for page in iter_message_pages(client, columns, **kwargs):
+        yield from page
+
+
+def get_chat_window_stats(client, chat_id, start, end):
+    """
+    Get aggregate statistics for a chat's messages in ``[start, end)``.
+
+    Calls the ``get_chat_window_stats`` SQL function so only the aggregates
+    cross the wire. Returns ``total_messages``, ``unique_participants``,
+    ``message_types``, ``hourly_activity`` (UTC hour -> count) and
+    ``last_message``.
+    """
+    response = client.rpc('get_chat_window_stats', {
+        'p_chat_id': chat_id,
+        'p_start': start.isoformat(),
+        'p_end': end.isoformat()
+    }).execute()
+    stats = response.data or {}
+
+    return {
+        'total_messages': stats.get('total_messages', 0),
+        'unique_participants': stats.get('unique_participants', 0),
+        'message_types': stats.get('message_types') or {},
+        'hourly_activity': stats.get('hourly_activity') or {},
+        'last_message': stats.get('last_message')
+    }
+
+
+def get_chats_activity_24h(client, chat_ids, cutoff):
+    """
+    Get current and previous 24h activity counts for many chats at once.
+
+    Returns a dict keyed by chat_id with ``messages_24h``, ``participants_24h``,
+    ``prev_messages_24h`` and ``prev_participants_24h``. Chats without any
+    messages since ``cutoff - 24h`` are absent from the result.
+    """
+    if not chat_ids:
+        return {}
+
+    response = client.rpc('get_chats_activity_24h', {
+        'p_chat_ids': list(chat_ids),
+        'p_cutoff': cutoff.isoformat()
+    }).execute()
+
+    return {row['chat_id']: row for row in response.data or []}
+
+
+def get_chats_active_since(client, since):
+    """
+    Get ``chats_v1`` rows for chats with a message at or after ``since``.
+
+    Reads the trigger-maintained ``last_message_at`` column, so the cost
+    scales with the number of chats rather than message volume.
+    """
+    response = client.table('chats_v1').select('*').gte(
+        'last_message_at', since.isoformat()
+    ).order('last_message_at', desc=True).execute()
+
+    return response.data
+
+
+def ceil_hour(value):
+    """Round a datetime up to a whole UTC hour; naive values are taken as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    floored = value.replace(minute=0, second=0, microsecond=0)
+    return floored if floored == value else floored + timedelta(hours=1)
+
+
+def get_chat_hourly_stats(client, chat_id, start, end):
+    """
+    Get ``chat_hourly_stats`` rollup rows for a chat, oldest hour first.
+    ``last_updated_at`` changes whenever a message in the hour is edited or
+    deleted, so the rows also stand in for the messages' content.
+
+    Hour buckets are included when they start in ``[ceil_hour(start),
+    ceil_hour(end))``, so consecutive windows partition the buckets and the
+    current partial hour belongs to the window ending now.
+    """
+    def apply_filters(query):
+        return query.eq('chat_id', chat_id).gte(
+            'hour', ceil_hour(start).isoformat()
+        ).lt('hour', ceil_hour(end).isoformat())
+
+    rows = []
+    for page in iter_keyset_pages(client, 'chat_hourly_stats',
+                                  'hour, message_count, message_types, participants, last_message_at, last_updated_at',
+                                  ['hour'], apply_filters):
+        rows.extend(page)
+    return rows
+
+
+def summarize_hourly_stats(rows, start=None, end=None):
+    """
+    Assemble window statistics from hourly rollup rows.
+
+    Returns the same shape as ``get_chat_window_stats``. When ``start`` and
+    ``end`` are given only the buckets in that window (see
+    ``get_chat_hourly_stats``) are counted, so one fetch can serve many windows.
+    """
+    lower = ceil_hour(start) if start is not None else None
+    upper = ceil_hour(end) if end is not None else None
+
+    total_messages = 0
+    participants = set()
+    message_types = {}
+    hourly_activity = {}
+    last_message = None
+
+    for row in rows:
+        hour = datetime.fromisoformat(row['hour'].replace('Z', '+00:00'))
+        if (lower is not None and hour < lower) or (upper is not None and hour >= upper):
+            continue
+
+        total_messages += row['message_count']
+        participants.update(row['participants'] or [])
+        for msg_type, count in (row['message_types'] or {}).items():
+            message_types[msg_type] = message_types.get(msg_type, 0) + count
+        hour_key = hour.astimezone(timezone.utc).strftime('%H')
+        hourly_activity[hour_key] = hourly_activity.get(hour_key, 0) + row['message_count']
+        if row['last_message_at'] and (last_message is None or row['last_message_at'] > last_message):
+            last_message = row['last_message_at']
+
+    return {
+        'total_messages': total_messages,
+        'unique_participants': len(participants),
+        'message_types': message_types,
+        'hourly_activity': hourly_activity,
+        'last_message': last_message
+    }
@@ -0,0 +1,104 @@
+"""
+Persistent on-disk cache of ``users_v1`` for resolving message authors.
+
+Each run pulls only the users changed since the previous run (by
+``updated_at``, with the mirror's overlap for late commits); lookups are then answered from the cache, and any misses
+are fetched in chunks small enough to keep the ``IN`` filter well under
+URL length limits.
+
+The cache lives at USER_DIRECTORY_PATH (default .cache/user_directory.json).
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from .mirror import iter_changed_pages, sync_started_at, utc_timestamp
+
+DEFAULT_USER_DIRECTORY_PATH = '.cache/user_directory.json'
+DEFAULT_CHUNK_SIZE = 200
+
+
+class UserDirectory:
+    """``users_v1`` rows keyed by user_id, persisted between runs."""
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.updated_at = None
+        self.users = {}
+        # Report pages are built on worker threads that share one directory
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.updated_at = data.get('updated_at')
+                self.users = {int(user_id): user for user_id, user in data.get('users', {}).items()}
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable user directory {self.path}: {e}")
+
+    def save(self):
+        """Write the directory to disk atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated_at': self.updated_at,
+                'users': {str(user_id): user for user_id, user in self.users.items()}
+            }, f, default=str)
+        os.replace(tmp_path, self.path)
+
+    def refresh(self, client):
+        """
+        Pull users changed since the last refresh.
+
+        The first refresh has no watermark and loads the whole table once;
+        after that only rows updated since (shortly before) the previous
+        refresh are transferred. Returns how many users were new or changed.
+        """
+        synced_at = sync_started_at()
+        count = 0
+
+        with self._lock:
+            for page in iter_changed_pages(client, 'users_v1', 'user_id', self.updated_at):
+                for user in page:
+                    held = self.users.get(user['user_id'])
+                    if held is None or utc_timestamp(held.get('updated_at')) != utc_timestamp(user.get('updated_at')):
+                        count += 1
+                    self.users[user['user_id']] = user
+            self.updated_at = synced_at
+            self.save()
+        return count
+
+    def lookup(self, client, user_ids):
+        """
+        Get ``{user_id: row}`` for the given user IDs.
+
+        Users missing from the cache are fetched in chunks of ``chunk_size``
+        and remembered; IDs with no ``users_v1`` row are left out.
+        """
+        user_ids = set(user_ids)
+        with self._lock:
+            missing = sorted(user_id for user_id in user_ids if user_id not in self.users)
+
+        fetched = []
+        for i in range(0, len(missing), self.chunk_size):
+            chunk = missing[i:i + self.chunk_size]
+            fetched.extend(client.table('users_v1').select('*').in_('user_id', chunk).execute().data)
+
+        with self._lock:
+            if fetched:
+                for user in fetched:
+                    self.users[user['user_id']] = user
+                self.save()
+            return {user_id: self.users[user_id] for user_id in user_ids if user_id in self.users}
+
+
+def open_user_directory(client):
+    """Open the user directory configured by USER_DIRECTORY_PATH and refresh it"""
+    directory = UserDirectory(os.getenv('USER_DIRECTORY_PATH', DEFAULT_USER_DIRECTORY_PATH))
+    directory.refresh(client)
+    return directory
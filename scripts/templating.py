@@ -0,0 +1,108 @@
+"""
+Shared Jinja2 environment for every generated HTML page.
+
+Page templates live in templates/ at the repository root and extend the
+partials in templates/partials/. All pages render through one environment,
+so each template is compiled once per process and reused for every page
+built from it; the compiled bytecode is also cached on disk, so later builds
+skip parsing altogether. Output is auto-escaped: chat messages, titles and
+repository descriptions are always rendered as text, never as markup.
+
+Shared stylesheets are published next to the pages as content-hashed files
+(e.g. ``assets/report.<hash>.css``) and linked rather than inlined, so a
+browser downloads each version once however many pages use it.
+"""
+
+import hashlib
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from build_manifest import source_version
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+BYTECODE_CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'jinja2'
+
+# Every template file, for fingerprinting the pages rendered from them
+TEMPLATE_SOURCES = sorted(TEMPLATES_DIR.rglob('*.html'))
+
+# Rendered output is written to disk in chunks of about this many fragments
+STREAM_BUFFER_SIZE = 64
+
+_environment = None
+_lock = threading.Lock()
+_assets_lock = threading.Lock()
+
+
+def military_time(timestamp):
+    """Format an ISO timestamp as e.g. 2025-07-20 1430Z"""
+    try:
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        return dt.strftime('%Y-%m-%d %H%MZ')
+    except Exception:
+        return timestamp
+
+
+def thousands(value):
+    """Format a number with thousands separators"""
+    return f"{value or 0:,}"
+
+
+def get_environment():
+    """Get the shared template environment, creating it on first use"""
+    global _environment
+    with _lock:
+        if _environment is None:
+            BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _environment = Environment(
+                loader=FileSystemLoader(str(TEMPLATES_DIR)),
+                autoescape=select_autoescape(['html']),
+                # Cached bytecode does not record the options below, so key it by this file
+                bytecode_cache=FileSystemBytecodeCache(
+                    str(BYTECODE_CACHE_DIR), f'{source_version(__file__)}-%s.cache'
+                ),
+                # Templates do not change during a build, so never re-stat them
+                auto_reload=False,
+                trim_blocks=True,
+                keep_trailing_newline=True,
+                lstrip_blocks=True,
+            )
+            _environment.filters['military_time'] = military_time
+            _environment.filters['thousands'] = thousands
+    return _environment
+
+
+def render(template_name, **context):
+    """Render a template from templates/ with the given context"""
+    return get_environment().get_template(template_name).render(**context)
+
+
+def render_to_file(template_name, path, **context):
+    """
+    Render a template straight into ``path``. Fragments are written as they
+    are produced, so a page is never held in memory as one string.
+    """
+    stream = get_environment().get_template(template_name).stream(**context)
+    stream.enable_buffering(STREAM_BUFFER_SIZE)
+    stream.dump(str(path), encoding='utf-8')
+
+
+def publish_stylesheet(name, css, assets_dir, page_dir):
+    """
+    Write ``css`` to ``assets_dir/<name>.<hash>.css`` unless that version is
+    already there, and return its URL relative to pages in ``page_dir``.
+    A changed stylesheet gets a new name, so cached copies never go stale;
+    old versions are kept for the older pages that still link them.
+    """
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]
+    path = Path(assets_dir) / f"{name}.{digest}.css"
+    with _assets_lock:
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + '.tmp')
+            tmp_path.write_text(css, encoding='utf-8')
+            os.replace(tmp_path, path)
+    return Path(os.path.relpath(path, page_dir)).as_posix()
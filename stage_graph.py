@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Stage Graph - a small dependency-ordered build scheduler.
+
+Each stage names the artifacts it consumes and produces. A stage starts as
+soon as the producers of all its inputs have finished, so stages on
+independent branches run at the same time on a thread pool. After a run the
+graph reports how long every stage took, which chain of stages bounded
+the total (the critical path) and, for stages grouped into branches, which
+branches built completely.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class StageGraph:
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.stages = {}
+        self.producers = {}
+        self.timings = {}
+        self.errors = {}
+        self.skipped = set()
+
+    def add_stage(self, name, func, inputs=(), outputs=(), branch=None):
+        """
+        Register a stage.
+
+        ``func`` is called with one keyword argument per input artifact. With a
+        single output its return value is that artifact; with several it must
+        return a dict keyed by output name. ``branch`` names the group of
+        stages (e.g. one site section) the stage's status is reported under.
+        """
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        for output in outputs:
+            if output in self.producers:
+                raise ValueError(f"Artifact {output} is produced by both {self.producers[output]} and {name}")
+            self.producers[output] = name
+        self.stages[name] = {'func': func, 'inputs': list(inputs), 'outputs': list(outputs), 'branch': branch}
+
+    def dependencies(self, name):
+        """Names of the stages whose outputs ``name`` consumes"""
+        deps = []
+        for artifact in self.stages[name]['inputs']:
+            if artifact not in self.producers:
+                raise ValueError(f"Stage {name} needs {artifact}, which no stage produces")
+            if self.producers[artifact] not in deps:
+                deps.append(self.producers[artifact])
+        return deps
+
+    def _run_stage(self, name, artifacts):
+        stage = self.stages[name]
+        kwargs = {artifact: artifacts[artifact] for artifact in stage['inputs']}
+        started = time.perf_counter()
+        try:
+            result = stage['func'](**kwargs)
+        finally:
+            self.timings[name] = (started, time.perf_counter())
+
+        if len(stage['outputs']) == 1:
+            return {stage['outputs'][0]: result}
+        if stage['outputs']:
+            return {output: result[output] for output in stage['outputs']}
+        return {}
+
+    def run(self):
+        """
+        Run every stage and return the produced artifacts.
+
+        A failed stage is recorded in ``errors`` and the stages downstream of
+        it are skipped; unrelated branches still run to completion.
+        """
+        deps = {name: self.dependencies(name) for name in self.stages}
+        artifacts = {}
+        pending = set(self.stages)
+        done = set()
+        skipped = self.skipped = set()
+        self.timings = {}
+        self.errors = {}
+        self.started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                # Skip stages that can never run, then start everything that is ready
+                for name in sorted(pending):
+                    if any(dep in self.errors or dep in skipped for dep in deps[name]):
+                        pending.discard(name)
+                        skipped.add(name)
+                        print(f"⏭️  Skipping {name}: an upstream stage failed")
+                for name in sorted(pending):
+                    if all(dep in done for dep in deps[name]):
+                        pending.discard(name)
+                        running[executor.submit(self._run_stage, name, artifacts)] = name
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        artifacts.update(future.result())
+                        done.add(name)
+                    except Exception as e:
+                        self.errors[name] = e
+                        print(f"⚠️  Stage {name} failed: {e!r}")
+
+        self.finished = time.perf_counter()
+        return artifacts
+
+    def critical_path(self):
+        """The chain of dependent stages with the longest total duration"""
+        longest = {}
+
+        def path_to(name):
+            if name not in longest:
+                duration = self.duration(name)
+                best = max((path_to(dep) for dep in self.dependencies(name) if dep in self.timings),
+                           key=lambda path: path[0], default=(0.0, []))
+                longest[name] = (best[0] + duration, best[1] + [name])
+            return longest[name]
+
+        paths = [path_to(name) for name in self.timings]
+        return max(paths, key=lambda path: path[0], default=(0.0, []))
+
+    def branch_status(self):
+        """``{branch: (status, failed or skipped stages)}`` for the last run, status 'ok' or 'failed'"""
+        branches = {}
+        for name, stage in self.stages.items():
+            if stage['branch'] is None:
+                continue
+            broken = branches.setdefault(stage['branch'], [])
+            if name in self.errors or name in self.skipped:
+                broken.append(name)
+        return {branch: ('failed' if broken else 'ok', broken) for branch, broken in branches.items()}
+
+    def duration(self, name):
+        started, finished = self.timings[name]
+        return finished - started
+
+    def print_report(self):
+        """Print per-stage timings and the critical path of the last run"""
+        total, path = self.critical_path()
+        print("\n⏱️  Stage timings")
+        for name, (started, finished) in sorted(self.timings.items(), key=lambda item: item[1][0]):
+            marker = '*' if name in path else ' '
+            status = 'failed' if name in self.errors else 'ok'
+            print(f" {marker} {name:<20} {finished - started:7.2f}s  (started +{started - self.started:.2f}s, {status})")
+        print(f"   Critical path: {' → '.join(path)} ({total:.2f}s)")
+        print(f"   Wall time: {self.finished - self.started:.2f}s")
+        branches = self.branch_status()
+        if branches:
+            print("   Branches: " + ', '.join(
+                f"{branch} {status}" + (f" ({', '.join(broken)})" if broken else '')
+                for branch, (status, broken) in branches.items()
+            ))